@@ -0,0 +1,102 @@
+"""Время запроса с постоянными соединениями и без них.
+
+Прогоняет запросы к списку комментариев через WSGI-обработчик с
+CONN_MAX_AGE=0 (соединение на каждый запрос) и с постоянным
+соединением, считает открытые соединения. База берётся из переменных
+DB_* (например PostgreSQL), по умолчанию создаётся временный файл
+SQLite. Запуск из корня репозитория:
+
+    python benchmarks/bench_connections.py --requests 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import django  # type: ignore
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'yatube_api'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
+if 'DB_NAME' not in os.environ:
+    os.environ['DB_NAME'] = str(
+        Path(tempfile.mkdtemp()) / 'bench_connections.sqlite3')
+django.setup()
+
+from django.contrib.auth import get_user_model  # type: ignore  # noqa: E402
+from django.core.management import call_command  # type: ignore  # noqa: E402
+from django.db import connection  # type: ignore  # noqa: E402
+from django.db.backends.signals import (  # type: ignore  # noqa: E402
+    connection_created)
+from django.core.handlers.wsgi import WSGIHandler  # type: ignore  # noqa
+from django.test import RequestFactory  # type: ignore  # noqa: E402
+
+from posts.models import Comment, Post  # noqa: E402
+
+User = get_user_model()
+
+
+def seed():
+    """Пост с комментариями для запросов."""
+    author, _ = User.objects.get_or_create(username='bench_connections')
+    post = Post.objects.create(text='Пост', author=author)
+    Comment.objects.bulk_create(
+        Comment(post=post, author=author, text=f'Комментарий {number}')
+        for number in range(20))
+    # bulk_create не вызывает сигналы счётчика.
+    Post.objects.filter(pk=post.pk).update(comment_count=20)
+    return post
+
+
+def request(handler, environ):
+    """Запрос через WSGI-обработчик, как у сервера приложений.
+
+    Тестовый клиент Django не закрывает соединения в конце запроса,
+    поэтому не подходит для сравнения.
+    """
+    response = handler(dict(environ), lambda status, headers: None)
+    b''.join(response)
+    response.close()
+
+
+def run(url, requests, max_age):
+    """Среднее время запроса в мс и число открытых соединений."""
+    connection.close()
+    connection.settings_dict['CONN_MAX_AGE'] = max_age
+    handler = WSGIHandler()
+    environ = RequestFactory(SERVER_NAME='localhost')._base_environ(
+        PATH_INFO=url, REQUEST_METHOD='GET')
+    opened = []
+
+    def count(sender, **kwargs):
+        opened.append(True)
+    request(handler, environ)
+    connection_created.connect(count)
+    started = time.perf_counter()
+    for _ in range(requests):
+        request(handler, environ)
+    elapsed = (time.perf_counter() - started) / requests * 1000
+    connection_created.disconnect(count)
+    return elapsed, len(opened)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--max-age', type=int, default=60)
+    args = parser.parse_args()
+
+    call_command('migrate', verbosity=0)
+    post = seed()
+    url = f'/api/v1/posts/{post.id}/comments/'
+    print(f'{"CONN_MAX_AGE":<14}{"мс/запрос":>12}{"соединений":>12}')
+    for max_age in (0, args.max_age):
+        elapsed, opened = run(url, args.requests, max_age)
+        print(f'{max_age:<14}{elapsed:>12.3f}{opened:>12}')
+    post.delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Время и пиковая память рендеринга страницы постов в JSON.
+
+Сравнивает стандартный JSONRenderer DRF и FastJSONRenderer на странице
+постов в формате ответа PostSerializer. Запуск из корня репозитория:
+
+    python benchmarks/bench_renderer.py --items 1000 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import django  # type: ignore
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'yatube_api'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # type: ignore  # noqa
+from rest_framework.utils.serializer_helpers import (  # type: ignore  # noqa
+    ReturnList)
+
+from api.renderers import FastJSONRenderer, orjson  # noqa: E402
+
+
+def make_page(items):
+    """Страница постов как у PostSerializer."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return ReturnList((
+        OrderedDict((
+            ('id', number),
+            ('author', f'author_{number % 50}'),
+            ('text', 'Текст поста для проверки скорости рендеринга. ' * 5),
+            ('pub_date', (start + timedelta(minutes=number)).isoformat()),
+            ('image', f'http://testserver/media/posts/{number}.jpg'),
+            ('comment_count', number % 17),
+            ('image_variants', {
+                '320': f'/media/posts/variants/{number}-320.jpg',
+                'thumbnail': f'/media/posts/variants/{number}-thumb.webp',
+            }),
+            ('group', number % 10 or None),
+        ))
+        for number in range(items)
+    ), serializer=None)
+
+
+def measure(renderer, data, repeat):
+    """Среднее время в миллисекундах и пиковая память в КиБ."""
+    renderer.render(data)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = renderer.render(data)
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    tracemalloc.start()
+    renderer.render(data)
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return elapsed, peak, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    if orjson is None:
+        print('orjson не установлен, FastJSONRenderer использует json.')
+
+    data = make_page(args.items)
+    print(f'{"рендерер":<20}{"мс":>10}{"пик КиБ":>12}{"байт":>12}')
+    for renderer in (JSONRenderer(), FastJSONRenderer()):
+        elapsed, peak, size = measure(renderer, data, args.repeat)
+        print(f'{type(renderer).__name__:<20}{elapsed:>10.2f}'
+              f'{peak:>12.0f}{size:>12}')
+
+
+if __name__ == '__main__':
+    main()
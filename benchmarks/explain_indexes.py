@@ -0,0 +1,102 @@
+"""Планы запросов API к составным индексам.
+
+Наполняет базу из настроек проекта (SQLite или PostgreSQL) тестовыми
+записями, собирает статистику, печатает планы основных запросов и
+откатывает изменения. Запуск из корня репозитория:
+
+    python benchmarks/explain_indexes.py --posts 20000
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import django  # type: ignore
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'yatube_api'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
+django.setup()
+
+from django.contrib.auth import get_user_model  # type: ignore  # noqa: E402
+from django.db import connection, transaction  # type: ignore  # noqa: E402
+from django.db.models import Q  # type: ignore  # noqa: E402
+from django.utils import timezone  # type: ignore  # noqa: E402
+
+from posts.models import Comment, Follow, Group, Post  # noqa: E402
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    """Отмена тестовых данных."""
+
+
+def seed(posts_count):
+    """Тестовые пользователи, группы, посты, комментарии и подписки."""
+    User.objects.bulk_create(
+        User(username=f'explain_{number}') for number in range(100))
+    users = list(User.objects.filter(username__startswith='explain_'))
+    Group.objects.bulk_create(
+        Group(title=f'Группа {number}', slug=f'explain-{number}')
+        for number in range(10))
+    groups = list(Group.objects.filter(slug__startswith='explain-'))
+    Post.objects.bulk_create(
+        (Post(text='Текст', author=users[number % len(users)],
+              group=groups[number % len(groups)])
+         for number in range(posts_count)),
+        batch_size=1000)
+    post_ids = list(Post.objects.values_list('id', flat=True)[:1000])
+    Comment.objects.bulk_create(
+        (Comment(text='Коммент', author=users[number % len(users)],
+                 post_id=post_ids[number % len(post_ids)])
+         for number in range(posts_count)),
+        batch_size=1000)
+    Follow.objects.bulk_create(
+        Follow(user=user, following=users[(number + step) % len(users)])
+        for number, user in enumerate(users) for step in range(1, 6))
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return users[0].id, groups[0].id, post_ids[0]
+
+
+def get_queries(author_id, group_id, post_id):
+    """Запросы API и ожидаемые индексы."""
+    now = timezone.now()
+    return (
+        ('Список постов', 'post_pub_date_id_idx',
+         Post.objects.all()[:20]),
+        ('Страница постов по курсору', 'post_pub_date_id_idx',
+         Post.objects.filter(
+             Q(pub_date__gt=now) | Q(pub_date=now, id__gt=post_id)
+         ).order_by('pub_date', 'id')[:20]),
+        ('Посты группы', 'post_group_pub_date_idx',
+         Post.objects.filter(group=group_id)[:20]),
+        ('Посты автора', 'post_author_pub_date_idx',
+         Post.objects.filter(author=author_id).order_by('-pub_date')[:20]),
+        ('Комментарии поста', 'comment_post_created_idx',
+         Comment.objects.filter(post=post_id)[:20]),
+        ('Подписчики автора', 'follow_following_user_idx',
+         Follow.objects.filter(following=author_id).values('user')),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=20000,
+                        help='Количество тестовых постов и комментариев.')
+    args = parser.parse_args()
+    print(f'База: {connection.vendor}')
+    try:
+        with transaction.atomic():
+            for title, index, queryset in get_queries(*seed(args.posts)):
+                plan = queryset.explain()
+                status = 'OK' if index in plan else 'НЕ ИСПОЛЬЗУЕТСЯ'
+                print(f'\n{title}: {index} - {status}\n{plan}')
+            raise Rollback
+    except Rollback:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""Нагрузочный прогон сценариев API против запущенного сервера.
+
+Для каждого сценария из scenarios.py выполняет --requests запросов в
+--concurrency потоков и считает задержки p50/p95/p99, пропускную
+способность, коды ответов и число запросов к базе на запрос из
+заголовка Server-Timing, который сервер отдаёт при
+METRICS_SERVER_TIMING=1. Результаты пишутся в
+benchmarks/results/<commit>.json, --compare печатает разницу с
+прошлым прогоном. Данные готовит команда seed_data. Пример:
+
+    python yatube_api/manage.py seed_data --users 10000 --posts 100000 \\
+        --comments 1000000
+    METRICS_SERVER_TIMING=1 python yatube_api/manage.py runserver \\
+        --noreload &
+    python benchmarks/run.py --base-url http://127.0.0.1:8000 \\
+        --requests 500 --concurrency 8 --compare <commit>
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests  # type: ignore
+
+from scenarios import PASSWORD, SCENARIOS, USERNAME, Context
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+QUERIES_RE = re.compile(r'db;[^,]*desc="(\d+) queries"')
+# Пользователей с токенами для запросов с авторизацией.
+TOKEN_USERS = 10
+
+_local = threading.local()
+
+
+def get_session():
+    """Сессия с постоянным соединением для потока."""
+    if not hasattr(_local, 'session'):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def get_commit():
+    """Короткий хеш текущего коммита с пометкой о правках."""
+    def git(*args):
+        return subprocess.run(('git', *args), capture_output=True,
+                              text=True).stdout.strip()
+    commit = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return f'{commit}-dirty' if git('status', '--porcelain') else commit
+
+
+def make_context(base_url, seed):
+    """Токены пользователей и id записей для построения запросов."""
+    session = get_session()
+    tokens, refresh_tokens = [], []
+    for number in range(TOKEN_USERS):
+        response = session.post(f'{base_url}/api/v1/jwt/create/', json={
+            'username': USERNAME.format(number=number),
+            'password': PASSWORD,
+        })
+        response.raise_for_status()
+        tokens.append(response.json()['access'])
+        refresh_tokens.append(response.json()['refresh'])
+    # Старые и свежие посты: первая и последняя страницы списка.
+    posts_url = f'{base_url}/api/v1/posts/?fields=id&limit=100'
+    count = session.get(posts_url).json()['count']
+    post_ids = [
+        post['id']
+        for offset in (0, max(count - 100, 0))
+        for post in session.get(f'{posts_url}&offset={offset}').json()[
+            'results']
+    ]
+    groups = session.get(f'{base_url}/api/v1/groups/').json()
+    return Context(random.Random(seed), post_ids,
+                   [group['id'] for group in groups], tokens, refresh_tokens)
+
+
+def send(base_url, scenario, context, lock):
+    """Один запрос: время в секундах, код ответа и запросы к базе."""
+    with lock:
+        path, body = scenario.build(context)
+        token = context.token()
+    headers = {'Authorization': f'Bearer {token}'} if scenario.auth else {}
+    started = time.perf_counter()
+    response = get_session().request(scenario.method, base_url + path,
+                                     json=body, headers=headers)
+    elapsed = time.perf_counter() - started
+    queries = QUERIES_RE.search(response.headers.get('Server-Timing', ''))
+    return elapsed, response.status_code, (
+        int(queries.group(1)) if queries else None)
+
+
+def run_scenario(base_url, scenario, context, requests_count, concurrency):
+    """Показатели сценария."""
+    lock = threading.Lock()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda _: send(base_url, scenario, context, lock),
+            range(requests_count)))
+    wall = time.perf_counter() - started
+    latencies = [elapsed * 1000 for elapsed, _, _ in results]
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    queries = [count for _, _, count in results if count is not None]
+    return {
+        'p50': cuts[49],
+        'p95': cuts[94],
+        'p99': cuts[98],
+        'rps': requests_count / wall,
+        'queries': statistics.mean(queries) if queries else None,
+        'statuses': dict(Counter(str(status) for _, status, _ in results)),
+    }
+
+
+def load_previous(name):
+    """Результаты прошлого прогона по коммиту или пути к файлу."""
+    path = Path(name)
+    if not path.exists():
+        path = RESULTS_DIR / f'{name}.json'
+    return json.loads(path.read_text())['scenarios']
+
+
+def print_report(results, previous):
+    """Таблица результатов, в скобках изменение p95 к прошлому прогону."""
+    print(f'{"сценарий":<22}{"p50 мс":>9}{"p95 мс":>9}{"p99 мс":>9}'
+          f'{"rps":>9}{"запросов":>10}  коды')
+    for name, result in results.items():
+        queries = result['queries']
+        line = (f'{name:<22}{result["p50"]:>9.1f}{result["p95"]:>9.1f}'
+                f'{result["p99"]:>9.1f}{result["rps"]:>9.1f}'
+                f'{"-" if queries is None else f"{queries:.1f}":>10}'
+                f'  {result["statuses"]}')
+        if name in previous:
+            change = result['p95'] / previous[name]['p95'] - 1
+            line += f'  (p95 {change:+.0%})'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--only', nargs='*',
+                        help='Имена сценариев для прогона.')
+    parser.add_argument('--writes', action='store_true',
+                        help='Добавить сценарии записи.')
+    parser.add_argument('--compare',
+                        help='Коммит или файл прошлого прогона.')
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip('/')
+    context = make_context(base_url, args.seed)
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if (not args.only or scenario.name in args.only)
+        and (args.writes or not scenario.write)
+    ]
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(
+            base_url, scenario, context, args.requests, args.concurrency)
+        print(f'{scenario.name}: готово', file=sys.stderr)
+    if all(result['queries'] is None for result in results.values()):
+        print('Нет заголовка Server-Timing: запустите сервер с '
+              'METRICS_SERVER_TIMING=1.', file=sys.stderr)
+
+    commit = get_commit()
+    RESULTS_DIR.mkdir(exist_ok=True)
+    (RESULTS_DIR / f'{commit}.json').write_text(json.dumps({
+        'commit': commit,
+        'base_url': base_url,
+        'requests': args.requests,
+        'concurrency': args.concurrency,
+        'scenarios': results,
+    }, ensure_ascii=False, indent=2))
+    print_report(results, load_previous(args.compare) if args.compare
+                 else {})
+
+
+if __name__ == '__main__':
+    main()
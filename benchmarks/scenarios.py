@@ -0,0 +1,97 @@
+"""Сценарии нагрузочных тестов для адресов API v1.
+
+Сценарий — метод, адрес и тело запроса. Адрес и тело могут быть
+функциями от контекста прогона: в нём генератор случайных чисел,
+id постов и групп и токены пользователей команды seed_data.
+"""
+
+# Пользователи команды seed_data.
+USERNAME = 'seed_{number}'
+PASSWORD = 'seed-password'
+
+
+class Scenario:
+    """Запрос одного вида."""
+
+    def __init__(self, name, path, method='GET', auth=False, body=None,
+                 write=False):
+        self.name = name
+        self.path = path
+        self.method = method
+        self.auth = auth
+        self.body = body
+        self.write = write
+
+    def build(self, context):
+        """Адрес и тело очередного запроса."""
+        path = self.path(context) if callable(self.path) else self.path
+        body = self.body(context) if callable(self.body) else self.body
+        return path, body
+
+
+class Context:
+    """Данные для построения запросов."""
+
+    def __init__(self, rng, post_ids, group_ids, tokens, refresh_tokens):
+        self.rng = rng
+        self.post_ids = post_ids
+        self.group_ids = group_ids
+        self.tokens = tokens
+        self.refresh_tokens = refresh_tokens
+
+    def post_id(self):
+        return self.rng.choice(self.post_ids)
+
+    def group_id(self):
+        return self.rng.choice(self.group_ids)
+
+    def token(self):
+        return self.rng.choice(self.tokens)
+
+
+SCENARIOS = (
+    Scenario('posts-list', '/api/v1/posts/?limit=20'),
+    Scenario('posts-list-offset',
+             lambda ctx: f'/api/v1/posts/?limit=20'
+                         f'&offset={ctx.rng.randint(0, 5000)}'),
+    Scenario('posts-list-cursor', '/api/v1/posts/?cursor=&limit=20'),
+    Scenario('posts-list-auth', '/api/v1/posts/?limit=20', auth=True),
+    Scenario('posts-list-sparse',
+             '/api/v1/posts/?limit=20&fields=id,author,text'),
+    Scenario('posts-list-expand',
+             '/api/v1/posts/?limit=20&expand=group,comments'),
+    Scenario('posts-search', '/api/v1/posts/?limit=20&search=текст'),
+    Scenario('posts-detail', lambda ctx: f'/api/v1/posts/{ctx.post_id()}/'),
+    Scenario('posts-detail-comments',
+             lambda ctx: f'/api/v1/posts/{ctx.post_id()}/'
+                         '?include=comments&comments_limit=20'),
+    Scenario('comments-list',
+             lambda ctx: f'/api/v1/posts/{ctx.post_id()}/comments/'
+                         '?limit=20'),
+    Scenario('groups-list', '/api/v1/groups/'),
+    Scenario('groups-detail',
+             lambda ctx: f'/api/v1/groups/{ctx.group_id()}/'),
+    Scenario('follows', '/api/v1/follow/', auth=True),
+    Scenario('feed', '/api/v1/feed/?limit=20', auth=True),
+    Scenario('export-posts',
+             lambda ctx: f'/api/v1/export/posts/'
+                         f'?after={max(ctx.post_ids) - 100}',
+             auth=True),
+    Scenario('jwt-create', '/api/v1/jwt/create/', method='POST',
+             body=lambda ctx: {
+                 'username': USERNAME.format(number=ctx.rng.randint(0, 9)),
+                 'password': PASSWORD,
+             }),
+    Scenario('jwt-verify', '/api/v1/jwt/verify/', method='POST',
+             body=lambda ctx: {'token': ctx.token()}),
+    Scenario('jwt-refresh', '/api/v1/jwt/refresh/', method='POST',
+             body=lambda ctx: {'refresh': ctx.rng.choice(ctx.refresh_tokens)}),
+    # Запись ограничена по частоте, ответы 429 видны в отчёте.
+    Scenario('posts-create', '/api/v1/posts/', method='POST', auth=True,
+             body={'text': 'Пост из нагрузочного теста'}, write=True),
+    Scenario('comments-create',
+             lambda ctx: f'/api/v1/posts/{ctx.post_id()}/comments/',
+             method='POST', auth=True,
+             body={'text': 'Комментарий из нагрузочного теста'},
+             write=True),
+)
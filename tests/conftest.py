@@ -1,6 +1,8 @@
 import sys
 import os
 
+import pytest
+
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(BASE_DIR)
@@ -30,6 +32,7 @@ if FILENAME not in project_dir_content:
 pytest_plugins = [
     'tests.fixtures.fixture_user',
     'tests.fixtures.fixture_data',
+    'tests.fixtures.fixture_queries',
 ]
 
 # test .md
@@ -44,3 +47,10 @@ with open(filename, 'r', errors='ignore') as f:
     assert file != default_md, (
         f'Не забудьте оформить `{filename}.`'
     )
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
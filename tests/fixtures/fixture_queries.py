@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture
+def assert_query_budget():
+    """Бюджет запросов к базе: общее число и повторы одной формы."""
+    from api.query_inspector import query_budget
+
+    return query_budget
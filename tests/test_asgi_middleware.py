@@ -0,0 +1,54 @@
+import asyncio
+from http import HTTPStatus
+
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import AsyncClient
+from django.urls import path
+import pytest
+
+# Запросы, дошедшие до представления.
+arrived: list = []
+
+
+async def rendezvous(request):
+    """Ответ, когда до представления дошли оба запроса."""
+    arrived.append(request)
+    for _ in range(100):
+        if len(arrived) == 2:
+            return HttpResponse('ok')
+        await asyncio.sleep(0.01)
+    return HttpResponse('timeout', status=HTTPStatus.GATEWAY_TIMEOUT)
+
+
+urlpatterns = [path('rendezvous/', rendezvous, name='rendezvous')]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncMiddleware:
+
+    @pytest.fixture(autouse=True)
+    def asgi(self, settings):
+        settings.ROOT_URLCONF = __name__
+        settings.METRICS_ENABLED = True
+        settings.METRICS_SERVER_TIMING = True
+        settings.QUERY_INSPECTOR = True
+        arrived.clear()
+
+    def test_concurrent_requests(self):
+        client = AsyncClient()
+
+        async def send_both():
+            return await asyncio.gather(client.get('/rendezvous/'),
+                                        client.get('/rendezvous/'))
+        responses = async_to_sync(send_both)()
+        assert [response.status_code for response in responses] == [
+            HTTPStatus.OK, HTTPStatus.OK
+        ], (
+            'Проверьте, что промежуточные обработчики API асинхронны и '
+            'под ASGI не выполняют запросы по одному.'
+        )
+        assert all('Server-Timing' in response for response in responses), (
+            'Проверьте, что под ASGI ответ содержит заголовок '
+            '`Server-Timing`.'
+        )
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import threading
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+
+from api.views import FollowView, PostViewSet
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsyncReadViews:
+
+    url = '/api/v1/posts/'
+
+    @pytest.fixture
+    def views(self, settings):
+        settings.ASYNC_READ_VIEWS = True
+        return PostViewSet.as_view({'get': 'list', 'post': 'create'})
+
+    def test_sync_by_default(self):
+        view = PostViewSet.as_view({'get': 'list'})
+        assert not asyncio.iscoroutinefunction(view), (
+            'Проверьте, что без `ASYNC_READ_VIEWS` представления остаются '
+            'синхронными.'
+        )
+
+    def test_read_in_pool(self, views, post, monkeypatch):
+        threads = []
+        list_view = PostViewSet.list
+
+        def spy(viewset, request, *args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return list_view(viewset, request, *args, **kwargs)
+        monkeypatch.setattr(PostViewSet, 'list', spy)
+
+        assert asyncio.iscoroutinefunction(views)
+        response = async_to_sync(views)(AsyncRequestFactory().get(self.url))
+        assert response.status_code == HTTPStatus.OK
+        assert [item['id'] for item in json.loads(response.content)] == [
+            post.id
+        ]
+        assert threads and threads[0].startswith('api-read'), (
+            'Проверьте, что чтение под ASGI выполняется в пуле потоков '
+            '`api-read`.'
+        )
+
+    def test_write_through_async_view(self, views, token):
+        request = AsyncRequestFactory().post(
+            self.url, data={'text': 'Пост'}, content_type='application/json',
+            authorization=f'Bearer {token["access"]}')
+        response = async_to_sync(views)(request)
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что запись через асинхронное представление работает.'
+        )
+
+    def test_follow_list(self, settings, user, another_user, token):
+        settings.ASYNC_READ_VIEWS = True
+        user.follows.create(following=another_user)
+        view = FollowView.as_view()
+        response = async_to_sync(view)(AsyncRequestFactory().get(
+            '/api/v1/follow/',
+            authorization=f'Bearer {token["access"]}'))
+        assert json.loads(response.content) == [
+            {'user': user.username, 'following': another_user.username,
+             'follower_count': 1}
+        ]
@@ -0,0 +1,42 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCachedAuthentication:
+
+    follow_url = '/api/v1/follow/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+
+    def test_no_user_query(self, user_client, follow_1,
+                           django_assert_num_queries):
+        user_client.get(self.follow_url)
+        # Только запрос подписок, пользователь берётся из кэша.
+        with django_assert_num_queries(1):
+            response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что повторный запрос с тем же токеном не загружает '
+            'пользователя из базы.'
+        )
+
+    def test_inactive_user(self, user_client, user):
+        user_client.get(self.follow_url)
+        user.is_active = False
+        user.save()
+
+        response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что блокировка пользователя действует сразу, без '
+            'ожидания истечения кэша.'
+        )
+
+    def test_author_write(self, user_client, post):
+        url = self.post_detail_url.format(post_id=post.id)
+        user_client.get(self.follow_url)
+        response = user_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что автор из кэша может изменять свои посты.'
+        )
+        post.refresh_from_db()
+        assert post.author.username == 'TestUser'
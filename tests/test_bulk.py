@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+from django.db import NotSupportedError, connection, transaction
+from django.db.transaction import TransactionManagementError
+import pytest
+
+from posts.bulk import bulk_create_with_pk
+from posts.models import Comment, FeedEntry, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulkCreate:
+
+    post_bulk_url = '/api/v1/posts/bulk/'
+    comment_bulk_url = '/api/v1/posts/{post_id}/comments/bulk/'
+
+    def test_bulk_not_auth(self, client):
+        response = client.post(self.post_bulk_url, data=[{'text': 'Пост'}],
+                               content_type='application/json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что POST-запрос неавторизованного пользователя к '
+            f'`{self.post_bulk_url}` возвращает ответ со статусом 401.'
+        )
+
+    def test_bulk_posts(self, settings, user_client, user, another_user,
+                        group_1, follow_4):
+        settings.BULK_BATCH_SIZE = 1
+        data = [
+            {'text': 'Пост 1', 'group': group_1.id},
+            {'group': group_1.id},
+            {'text': 'Пост 3'},
+        ]
+        response = user_client.post(self.post_bulk_url, data=data,
+                                    format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{self.post_bulk_url}` со списком '
+            'постов возвращает ответ со статусом 201.'
+        )
+        test_data = response.json()
+        assert [post['text'] for post in test_data['created']] == [
+            'Пост 1', 'Пост 3'
+        ], (
+            'Проверьте, что ответ содержит созданные посты в поле `created`.'
+        )
+        assert [error['index'] for error in test_data['errors']] == [1], (
+            'Проверьте, что ответ содержит ошибки с индексом элемента в поле '
+            '`errors`.'
+        )
+        ids = [post['id'] for post in test_data['created']]
+        assert list(Post.objects.filter(author=user).order_by('id')
+                    .values_list('id', flat=True)) == ids
+        assert FeedEntry.objects.filter(owner=another_user).count() == 2, (
+            'Проверьте, что созданные пакетом посты попадают в ленты '
+            'подписчиков.'
+        )
+
+    def test_bulk_posts_all_invalid(self, user_client):
+        response = user_client.post(self.post_bulk_url, data=[{}],
+                                    format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = user_client.post(self.post_bulk_url,
+                                    data={'text': 'Пост'}, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что тело запроса без списка возвращает ответ со '
+            'статусом 400.'
+        )
+
+    def test_bulk_comments(self, user_client, post):
+        url = self.comment_bulk_url.format(post_id=post.id)
+        response = user_client.post(
+            url, data=[{'text': f'Коммент {number}'} for number in range(3)],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос к `{url}` со списком комментариев '
+            'возвращает ответ со статусом 201.'
+        )
+        assert Comment.objects.filter(post=post).count() == 3
+        post.refresh_from_db()
+        assert post.comment_count == 3, (
+            'Проверьте, что пакетное создание комментариев обновляет '
+            '`comment_count` поста.'
+        )
+
+    def test_bulk_comments_post_not_found(self, user_client):
+        response = user_client.post(
+            self.comment_bulk_url.format(post_id=1000),
+            data=[{'text': 'Коммент'}], format='json'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_bulk_create_with_pk_backends(self, monkeypatch, group_1):
+        with pytest.raises(TransactionManagementError):
+            bulk_create_with_pk(Group, [Group(title='Вне транзакции')])
+        monkeypatch.setattr(connection, 'vendor', 'mysql')
+        with pytest.raises(NotSupportedError), transaction.atomic():
+            bulk_create_with_pk(Group, [Group(title='Без ключей')])
+        assert not Group.objects.exclude(pk=group_1.pk).exists(), (
+            'Проверьте, что `bulk_create_with_pk` не угадывает ключи по '
+            'последним строкам на базах, кроме SQLite, и вне транзакции.'
+        )
@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+from django.db import transaction
+import pytest
+
+from api.cache import get_version
+from posts.models import Comment, Group
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    group_url = '/api/v1/groups/'
+    group_detail_url = '/api/v1/groups/{group_id}/'
+    post_list_url = '/api/v1/posts/'
+
+    def test_group_list_cached(self, client, group_1,
+                               django_assert_num_queries):
+        client.get(self.group_url)
+        with django_assert_num_queries(0):
+            response = client.get(self.group_url)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()) == 1, (
+            f'Проверьте, что повторный GET-запрос к `{self.group_url}` '
+            'отдаётся из кэша без запросов к базе.'
+        )
+
+        Group.objects.create(title='Новая группа', slug='new')
+        response = client.get(self.group_url)
+        assert len(response.json()) == 2, (
+            'Проверьте, что создание группы сбрасывает кэш списка групп.'
+        )
+
+    def test_group_detail_invalidated(self, client, group_1):
+        url = self.group_detail_url.format(group_id=group_1.id)
+        client.get(url)
+        group_1.title = 'Новое название'
+        group_1.save()
+
+        response = client.get(url)
+        assert response.json()['title'] == group_1.title, (
+            'Проверьте, что изменение группы сбрасывает кэш группы.'
+        )
+
+    def test_anonymous_post_list_cached(self, client, post, user,
+                                        django_assert_num_queries):
+        client.get(self.post_list_url)
+        with django_assert_num_queries(0):
+            client.get(self.post_list_url)
+
+        post.text = 'Новый текст'
+        post.save()
+        response = client.get(self.post_list_url)
+        assert response.json()[0]['text'] == post.text, (
+            'Проверьте, что изменение поста сбрасывает кэш списка постов.'
+        )
+
+        client.get(self.post_list_url)
+        Comment.objects.create(author=user, post=post, text='Коммент')
+        with django_assert_num_queries(1):
+            client.get(self.post_list_url)
+
+    def test_cache_key_absolute_url(self, settings, client, post,
+                                    another_post):
+        settings.ALLOWED_HOSTS = ['a.example', 'b.example']
+        url = f'{self.post_list_url}?limit=1'
+        client.get(url, HTTP_HOST='a.example')
+        links = [
+            client.get(url, HTTP_HOST='b.example').json()['next'],
+            client.get(url, HTTP_HOST='a.example', secure=True).json()[
+                'next'],
+        ]
+        assert [link.split('/api/')[0] for link in links] == [
+            'http://b.example', 'https://a.example'
+        ], (
+            'Проверьте, что ключ кэша ответа включает схему и хост: '
+            'ответ содержит абсолютные ссылки.'
+        )
+
+    def test_auth_post_list_not_cached(self, user_client, post,
+                                       django_assert_num_queries):
+        user_client.get(self.post_list_url)
+        # Только список постов: ответ не из кэша, пользователь из кэша.
+        with django_assert_num_queries(1):
+            response = user_client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_version_bumped_after_commit(self, post, user):
+        version = get_version('posts')
+        with transaction.atomic():
+            Comment.objects.create(author=user, post=post, text='Коммент')
+            assert get_version('posts') == version, (
+                'Проверьте, что версия коллекции меняется только после '
+                'фиксации транзакции.'
+            )
+        assert get_version('posts') != version, (
+            'Проверьте, что после фиксации транзакции версия коллекции '
+            'меняется.'
+        )
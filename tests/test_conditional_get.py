@@ -0,0 +1,103 @@
+import time
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.utils.http import http_date
+import pytest
+
+from api.cache import CHANGED_KEY
+from posts.models import Comment
+
+
+def set_changed(namespace, changed):
+    """Время последнего изменения коллекции."""
+    cache.set(CHANGED_KEY.format(namespace=namespace), changed, timeout=None)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    post_list_url = '/api/v1/posts/'
+    comment_list_url = '/api/v1/posts/{post_id}/comments/'
+    group_url = '/api/v1/groups/'
+
+    def check_not_modified(self, client, url, namespace, queries_check):
+        # Изменение в прошлой секунде: Last-Modified уже выдаётся.
+        set_changed(namespace, time.time() - 2)
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `ETag`.'
+        )
+        assert response.has_header('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовок `Last-Modified`.'
+        )
+        with queries_check(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304 без запросов '
+            'к базе.'
+        )
+        return response['ETag']
+
+    def test_post_list(self, client, post, django_assert_num_queries):
+        etag = self.check_not_modified(client, self.post_list_url, 'posts',
+                                       django_assert_num_queries)
+        post.text = 'Новый текст'
+        post.save()
+        response = client.get(self.post_list_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения поста GET-запрос с прежним '
+            '`If-None-Match` возвращает ответ со статусом 200.'
+        )
+
+    def test_comment_list(self, client, post, another_post, user,
+                          django_assert_num_queries):
+        url = self.comment_list_url.format(post_id=post.id)
+        etag = self.check_not_modified(client, url, f'comments:{post.id}',
+                                       django_assert_num_queries)
+
+        Comment.objects.create(author=user, post=another_post, text='Другой')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что комментарий к другому посту не меняет ETag '
+            'списка комментариев.'
+        )
+
+        Comment.objects.create(author=user, post=post, text='Новый')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'комментариев поста.'
+        )
+        assert len(response.json()) == 1
+
+    def test_group_list_if_modified_since(self, client, group_1):
+        set_changed('groups', time.time() - 2)
+        response = client.get(self.group_url)
+        response = client.get(
+            self.group_url,
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{self.group_url}` с актуальным '
+            '`If-Modified-Since` возвращает ответ со статусом 304.'
+        )
+
+    def test_change_in_current_second(self, client, group_1):
+        changed = time.time() + 0.5
+        set_changed('groups', changed)
+        response = client.get(self.group_url)
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что `Last-Modified` не выдаётся, пока не закончилась '
+            'секунда последнего изменения.'
+        )
+        response = client.get(
+            self.group_url, HTTP_IF_MODIFIED_SINCE=http_date(int(changed)))
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение в ту же секунду, что и '
+            '`If-Modified-Since`, не даёт ответ со статусом 304.'
+        )
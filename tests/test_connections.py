@@ -0,0 +1,54 @@
+import pytest
+from django.core.signals import request_started
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionHealthCheck:
+
+    @pytest.fixture
+    def closed(self, monkeypatch):
+        """Вызовы закрытия соединения."""
+        calls = []
+        monkeypatch.setattr(connection, 'close', lambda: calls.append(True))
+        connection.ensure_connection()
+        return calls
+
+    @pytest.fixture
+    def checks(self, monkeypatch):
+        """Проверки соединения, is_usable возвращает False."""
+        calls = []
+
+        def is_usable():
+            calls.append(True)
+            return False
+        monkeypatch.setattr(connection, 'is_usable', is_usable)
+        return calls
+
+    def test_unusable_connection_closed(self, closed, checks):
+        request_started.send(sender=None)
+        # Так соединение трогает close_old_connections в конце запроса.
+        connection.get_autocommit()
+        assert not checks, (
+            'Проверьте, что соединение не проверяется до первого обращения '
+            'к базе в запросе.'
+        )
+        connection.cursor().close()
+        connection.cursor().close()
+        assert closed and len(checks) == 1, (
+            'Проверьте, что при первом обращении к базе в запросе '
+            'неработающее постоянное соединение закрывается.'
+        )
+
+    def test_usable_connection_kept(self, closed):
+        request_started.send(sender=None)
+        connection.cursor().close()
+        assert not closed, (
+            'Проверьте, что работающее соединение переиспользуется.'
+        )
+
+    def test_checks_disabled(self, settings, closed, checks):
+        settings.DATABASE_HEALTH_CHECKS = False
+        request_started.send(sender=None)
+        connection.cursor().close()
+        assert not closed and not checks
@@ -0,0 +1,81 @@
+from django.core.management import call_command
+import pytest
+
+from posts.models import Comment, Post, Profile
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCounters:
+
+    comment_list_url = '/api/v1/posts/{post_id}/comments/'
+    comment_detail_url = '/api/v1/posts/{post_id}/comments/{comment_id}/'
+    follow_url = '/api/v1/follow/'
+
+    def test_comment_count(self, user_client, post):
+        url = self.comment_list_url.format(post_id=post.id)
+        user_client.post(url, data={'text': 'Коммент 1'})
+        response = user_client.post(url, data={'text': 'Коммент 2'})
+        post.refresh_from_db()
+        assert post.comment_count == 2, (
+            'Проверьте, что создание комментария увеличивает '
+            '`comment_count` поста.'
+        )
+
+        user_client.delete(self.comment_detail_url.format(
+            post_id=post.id, comment_id=response.json()['id']))
+        post.refresh_from_db()
+        assert post.comment_count == 1, (
+            'Проверьте, что удаление комментария уменьшает '
+            '`comment_count` поста.'
+        )
+        response = user_client.get(f'/api/v1/posts/{post.id}/')
+        assert response.json()['comment_count'] == 1, (
+            'Проверьте, что ответ с постом содержит поле `comment_count`.'
+        )
+
+    def test_follower_count(self, user_client, another_user):
+        user_client.post(self.follow_url,
+                         data={'following': another_user.username})
+        assert Profile.objects.get(user=another_user).follower_count == 1, (
+            'Проверьте, что подписка увеличивает `follower_count` автора.'
+        )
+
+    def test_reconcile_counters(self, post, user, another_user, follow_1):
+        Comment.objects.create(author=user, post=post, text='Коммент')
+        Post.objects.filter(id=post.id).update(comment_count=5)
+        Profile.objects.all().delete()
+
+        call_command('reconcile_counters', batch_size=1)
+        post.refresh_from_db()
+        assert post.comment_count == 1, (
+            'Проверьте, что команда `reconcile_counters` исправляет '
+            '`comment_count`.'
+        )
+        assert Profile.objects.get(user=another_user).follower_count == 1, (
+            'Проверьте, что команда `reconcile_counters` создаёт профили и '
+            'исправляет `follower_count`.'
+        )
+
+    def test_drifted_counters_not_negative(self, post, user, another_user,
+                                           follow_1):
+        comment = Comment.objects.create(author=user, post=post,
+                                         text='Коммент')
+        Post.objects.filter(id=post.id).update(comment_count=0)
+        Profile.objects.filter(user=another_user).update(follower_count=0)
+
+        comment.delete()
+        follow_1.delete()
+        post.refresh_from_db()
+        assert post.comment_count == 0, (
+            'Проверьте, что разошедшийся `comment_count` не уходит ниже нуля.'
+        )
+        assert Profile.objects.get(user=another_user).follower_count == 0, (
+            'Проверьте, что разошедшийся `follower_count` не уходит ниже '
+            'нуля.'
+        )
+
+    def test_delete_followed_user(self, user, another_user, follow_1):
+        another_user.delete()
+        assert not Profile.objects.filter(user=another_user.id).exists(), (
+            'Проверьте, что удаление пользователя удаляет его профиль.'
+        )
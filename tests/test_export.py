@@ -0,0 +1,91 @@
+from http import HTTPStatus
+from io import StringIO
+import json
+
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExport:
+
+    url = '/api/v1/export/posts/'
+
+    def read_lines(self, response):
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.url}` возвращает ответ со статусом 200.'
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        content = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_not_auth(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_export(self, settings, user_client, post, another_post,
+                    comment_1_post, comment_2_post):
+        settings.EXPORT_CHUNK_SIZE = 1
+        records = self.read_lines(user_client.get(self.url))
+
+        assert [record['id'] for record in records] == [
+            post.id, another_post.id
+        ], (
+            f'Проверьте, что `{self.url}` выгружает все посты по '
+            'возрастанию `id`, по одному на строку.'
+        )
+        assert records[0]['author'] == post.author.username
+        assert [comment['id'] for comment in records[0]['comments']] == [
+            comment_1_post.id, comment_2_post.id
+        ], (
+            'Проверьте, что каждый пост выгружается со своими комментариями.'
+        )
+        assert records[1]['comments'] == []
+
+    def test_export_after(self, user_client, post, another_post):
+        records = self.read_lines(
+            user_client.get(f'{self.url}?after={post.id}'))
+        assert [record['id'] for record in records] == [another_post.id], (
+            'Проверьте, что параметр `after` продолжает выгрузку после '
+            'поста с указанным `id`.'
+        )
+        response = user_client.get(f'{self.url}?after=-1')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_export_asgi(self, settings, post, another_post, token):
+        settings.EXPORT_CHUNK_SIZE = 1
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(ASGIHandler())({
+            'type': 'http', 'method': 'GET', 'path': self.url,
+            'query_string': b'',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Bearer {token["access"]}'.encode()),
+            ],
+        }, receive, send)
+        assert messages[0]['status'] == HTTPStatus.OK
+        content = b''.join(message.get('body', b'') for message in messages
+                           if message['type'] == 'http.response.body')
+        assert [json.loads(line)['id'] for line in content.splitlines()] == [
+            post.id, another_post.id
+        ], (
+            f'Проверьте, что `{self.url}` выгружает посты под ASGI, где '
+            'Django перебирает потоковый ответ в цикле событий.'
+        )
+
+    def test_export_command(self, post, comment_1_post):
+        output = StringIO()
+        call_command('export_posts', stdout=output)
+        record = json.loads(output.getvalue())
+        assert record['id'] == post.id
+        assert record['comments'][0]['text'] == comment_1_post.text
@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import FeedEntry, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFeedAPI:
+
+    url = '/api/v1/feed/'
+
+    def get_feed_ids(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос авторизованного пользователя к '
+            f'`{self.url}` возвращает ответ со статусом 200.'
+        )
+        return [item['id'] for item in response.json()]
+
+    def test_feed_not_auth(self, client):
+        response = client.get(self.url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что GET-запрос неавторизованного пользователя к '
+            f'`{self.url}` возвращает ответ со статусом 401.'
+        )
+
+    def test_feed_fan_out(self, user_client, user, user_2, another_user):
+        Follow.objects.create(user=user, following=another_user)
+        first = Post.objects.create(text='Пост 1', author=another_user)
+        second = Post.objects.create(text='Пост 2', author=another_user)
+        Post.objects.create(text='Чужой пост', author=user_2)
+        Post.objects.create(text='Свой пост', author=user)
+
+        assert FeedEntry.objects.filter(owner=user).count() == 2, (
+            'Проверьте, что новый пост раскладывается по лентам подписчиков.'
+        )
+        assert self.get_feed_ids(user_client) == [second.id, first.id], (
+            f'Проверьте, что `{self.url}` возвращает посты авторов из '
+            'подписок, новые сначала.'
+        )
+
+    def test_feed_backfill_and_unfollow(self, user_client, user,
+                                        another_user):
+        post = Post.objects.create(text='Пост', author=another_user)
+        follow = Follow.objects.create(user=user, following=another_user)
+        assert self.get_feed_ids(user_client) == [post.id], (
+            'Проверьте, что при подписке в ленту добавляются последние '
+            'посты автора.'
+        )
+
+        follow.delete()
+        assert self.get_feed_ids(user_client) == [], (
+            'Проверьте, что после отписки посты автора пропадают из ленты.'
+        )
+
+    def test_feed_heavy_author(self, settings, user_client, user,
+                               another_user):
+        settings.FEED_FANOUT_LIMIT = 0
+        Follow.objects.create(user=user, following=another_user)
+        post = Post.objects.create(text='Пост', author=another_user)
+
+        assert not FeedEntry.objects.exists(), (
+            'Проверьте, что посты авторов с числом подписчиков больше '
+            '`FEED_FANOUT_LIMIT` не раскладываются по лентам.'
+        )
+        assert self.get_feed_ids(user_client) == [post.id], (
+            'Проверьте, что посты авторов без раскладки добавляются в ленту '
+            'при чтении.'
+        )
+
+    def test_feed_pages_merge_heavy_authors(self, settings, user_client,
+                                            user, user_2, another_user):
+        settings.FEED_FANOUT_LIMIT = 1
+        Follow.objects.create(user=user, following=another_user)
+        Follow.objects.create(user=user, following=user_2)
+        Follow.objects.create(user=another_user, following=user_2)
+        posts = [
+            Post.objects.create(text=f'Пост {number}',
+                                author=(user_2, another_user)[number % 2])
+            for number in range(7)
+        ]
+        expected = [post.id for post in reversed(posts)]
+        assert FeedEntry.objects.filter(owner=user).count() == 3, (
+            'Проверьте, что посты популярного автора не раскладываются.'
+        )
+
+        response = user_client.get(f'{self.url}?limit=3&offset=2')
+        test_data = response.json()
+        assert test_data['count'] == 7 and [
+            item['id'] for item in test_data['results']
+        ] == expected[2:5], (
+            'Проверьте, что страница ленты объединяет записи ленты и посты '
+            'популярных авторов в порядке публикации.'
+        )
+
+        ids, url = [], f'{self.url}?cursor=&limit=3'
+        while url:
+            test_data = user_client.get(url).json()
+            ids.extend(item['id'] for item in test_data['results'])
+            url = test_data['next']
+        assert ids == expected, (
+            'Проверьте, что пагинация ленты по ключу проходит все посты '
+            'по одному разу, новые сначала.'
+        )
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from django.db.utils import IntegrityError
 import pytest
 
+from api.serializers import FollowSerializer
 from posts.models import Follow
 
 
@@ -190,3 +191,17 @@ class TestFollowAPI:
             f'GET-запрос с параметром `search` к `{self.url}` содержит только '
             'те подписки, которые удовлетворяют параметрам поиска.'
         )
+
+    def test_follow_follower_count(self, user_client, another_user,
+                                   follow_1, follow_2, follow_3,
+                                   monkeypatch):
+        monkeypatch.setattr(FollowSerializer, 'to_representation', None)
+        response = user_client.get(self.url)
+        assert response.json() == [{
+            'user': follow_1.user.username,
+            'following': another_user.username,
+            'follower_count': 2,
+        }], (
+            'Проверьте, что подписка содержит число подписчиков автора в '
+            'поле `follower_count`, а список выводится без сериализатора.'
+        )
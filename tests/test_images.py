@@ -0,0 +1,55 @@
+from http import HTTPStatus
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+import pytest
+
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestImageProcessing:
+
+    post_list_url = '/api/v1/posts/'
+
+    @pytest.fixture(autouse=True)
+    def media(self, settings, tmp_path):
+        settings.MEDIA_ROOT = tmp_path
+        settings.IMAGE_PROCESSING_BACKEND = 'sync'
+
+    def make_image(self, size=(800, 600)):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, format='JPEG')
+        return SimpleUploadedFile('photo.jpg', buffer.getvalue(),
+                                  content_type='image/jpeg')
+
+    def test_variants_created(self, user_client, tmp_path):
+        response = user_client.post(
+            self.post_list_url,
+            data={'text': 'Пост с картинкой', 'image': self.make_image()},
+            format='multipart'
+        )
+        assert response.status_code == HTTPStatus.CREATED
+
+        post = Post.objects.get(id=response.json()['id'])
+        assert set(post.image_variants) == {'320', '640', 'thumbnail'}, (
+            'Проверьте, что для изображения создаются уменьшенные копии '
+            'меньше исходной ширины и миниатюра.'
+        )
+        thumbnail = post.image_variants['thumbnail']
+        assert thumbnail.endswith('.webp'), (
+            'Проверьте, что миниатюра сохраняется в формате WebP.'
+        )
+        with Image.open(tmp_path / thumbnail.replace('/media/', '')) as image:
+            assert max(image.size) <= 160
+
+        response = user_client.get(f'{self.post_list_url}{post.id}/')
+        assert response.json()['image_variants'] == post.image_variants, (
+            'Проверьте, что ответ с постом содержит поле `image_variants`.'
+        )
+
+    def test_post_without_image(self, user_client):
+        response = user_client.post(self.post_list_url,
+                                    data={'text': 'Пост'})
+        assert response.json()['image_variants'] == {}
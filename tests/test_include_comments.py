@@ -0,0 +1,91 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment
+
+
+@pytest.mark.django_db(transaction=True)
+class TestIncludeComments:
+
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comments_count = 15
+
+    @pytest.fixture
+    def comments(self, post, django_user_model):
+        authors = [
+            django_user_model.objects.create_user(
+                username=f'Commenter{number}', password='1234567')
+            for number in range(3)
+        ]
+        return [
+            Comment.objects.create(author=authors[number % 3], post=post,
+                                   text=f'Коммент {number}')
+            for number in range(self.comments_count)
+        ]
+
+    def test_include_comments(self, client, post, comments):
+        url = self.post_detail_url.format(post_id=post.id)
+        response = client.get(f'{url}?include=comments')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}?include=comments` возвращает '
+            'ответ со статусом 200.'
+        )
+        test_data = response.json()
+        assert test_data['text'] == post.text, (
+            'Проверьте, что ответ с `include=comments` содержит поля поста.'
+        )
+        page = test_data.get('comments')
+        assert isinstance(page, dict) and page['count'] == len(comments), (
+            'Проверьте, что `include=comments` добавляет в ответ поле '
+            '`comments` с общим числом комментариев в `count`.'
+        )
+        assert [comment['text'] for comment in page['results']] == [
+            f'Коммент {number}' for number in range(10)
+        ], (
+            'Проверьте, что `comments.results` содержит первую страницу '
+            'комментариев по порядку создания.'
+        )
+        assert page['results'][0]['author'] == 'Commenter0', (
+            'Проверьте, что у комментариев в ответе указан автор.'
+        )
+        assert 'comments_offset=10' in page['next'], (
+            'Проверьте, что `comments.next` ведёт на следующую страницу '
+            'комментариев.'
+        )
+
+        response = client.get(
+            f'{url}?include=comments&comments_limit=4&comments_offset=12')
+        page = response.json()['comments']
+        assert [comment['text'] for comment in page['results']] == [
+            'Коммент 12', 'Коммент 13', 'Коммент 14'
+        ] and page['next'] is None, (
+            'Проверьте, что параметры `comments_limit` и `comments_offset` '
+            'выбирают страницу комментариев.'
+        )
+
+    def test_without_include(self, client, post, comments):
+        response = client.get(self.post_detail_url.format(post_id=post.id))
+        assert 'comments' not in response.json(), (
+            'Проверьте, что без `include=comments` ответ с постом не '
+            'содержит комментариев.'
+        )
+
+    def test_include_comments_queries(self, client, post, comments,
+                                      assert_query_budget):
+        url = self.post_detail_url.format(post_id=post.id)
+        # Пост с автором и страница комментариев с авторами.
+        with assert_query_budget(max_queries=2):
+            response = client.get(f'{url}?include=comments&comments_limit=15')
+        assert len(response.json()['comments']['results']) == 15, (
+            'Проверьте, что `include=comments` загружает пост и страницу '
+            'комментариев с авторами двумя запросами к базе.'
+        )
+
+    def test_include_comments_not_found(self, client):
+        url = self.post_detail_url.format(post_id=999)
+        response = client.get(f'{url}?include=comments')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что GET-запрос к `{url}?include=comments` для '
+            'несуществующего поста возвращает ответ со статусом 404.'
+        )
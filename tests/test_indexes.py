@@ -0,0 +1,59 @@
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+import pytest
+
+from posts.feed import FeedResults
+from posts.models import Comment, Follow, Post
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite',
+                    reason='Планы запросов проверяются на SQLite.')
+@pytest.mark.django_db
+class TestQueryPlans:
+
+    def check_plan(self, queryset, index_name):
+        plan = queryset.explain()
+        assert index_name in plan, (
+            f'Проверьте, что запрос использует индекс `{index_name}`. '
+            f'План запроса: {plan}'
+        )
+
+    def test_post_list(self):
+        now = timezone.now()
+        self.check_plan(Post.objects.all()[:10], 'post_pub_date_id_idx')
+        self.check_plan(
+            Post.objects.filter(
+                Q(pub_date__gt=now) | Q(pub_date=now, id__gt=1)
+            )[:10],
+            'post_pub_date_id_idx'
+        )
+
+    def test_post_by_group(self):
+        self.check_plan(Post.objects.filter(group=1),
+                        'post_group_pub_date_idx')
+
+    def test_post_by_author(self):
+        self.check_plan(Post.objects.filter(author=1).order_by('-pub_date'),
+                        'post_author_pub_date_idx')
+
+    def test_comments_of_post(self):
+        self.check_plan(Comment.objects.filter(post=1),
+                        'comment_post_created_idx')
+
+    def test_followers(self):
+        self.check_plan(
+            Follow.objects.filter(following=1).values('user'),
+            'follow_following_user_idx'
+        )
+
+    def test_feed_entries(self, user):
+        feed = FeedResults(user, Post.objects.all())
+        feed.after((timezone.now(), 1))
+        queryset = feed.entries.order_by(
+            '-pub_date', '-post_id').values_list('pub_date', 'post_id')[:10]
+        self.check_plan(queryset, 'feed_owner_pub_date_idx')
+        assert 'TEMP B-TREE' not in queryset.explain(), (
+            'Проверьте, что записи ленты читаются в порядке индекса '
+            '`feed_owner_pub_date_idx` без сортировки.'
+        )
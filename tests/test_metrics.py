@@ -0,0 +1,70 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.metrics import registry
+
+
+@pytest.mark.django_db(transaction=True)
+class TestMetrics:
+
+    post_list_url = '/api/v1/posts/'
+    metrics_url = '/metrics'
+
+    @pytest.fixture(autouse=True)
+    def empty_registry(self):
+        registry.reset()
+
+    def test_server_timing_disabled(self, client, post):
+        response = client.get(self.post_list_url)
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что `Server-Timing` по умолчанию не отдаётся '
+            'клиентам.'
+        )
+
+    def test_server_timing(self, settings, client, post):
+        settings.METRICS_SERVER_TIMING = True
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.post_list_url}?expand=group')
+        timing = response['Server-Timing']
+        assert re.search(r'total;dur=[\d.]+', timing), (
+            'Проверьте, что заголовок `Server-Timing` содержит общее время.'
+        )
+        queries = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', timing)
+        assert queries and int(queries.group(1)) == len(context), (
+            'Проверьте, что `Server-Timing` содержит число запросов к базе.'
+        )
+        assert 'serializer;dur=' in timing
+
+    def test_prometheus_histograms(self, client, post):
+        client.get(self.post_list_url)
+        client.get(self.post_list_url)
+        client.get(f'{self.post_list_url}{post.id}/')
+
+        response = client.get(self.metrics_url)
+        assert response.status_code == HTTPStatus.OK
+        text = response.content.decode()
+        assert ('api_request_duration_seconds_count{route="api:posts-list",'
+                'method="GET"} 2') in text, (
+            'Проверьте, что метрики копятся по имени маршрута и методу.'
+        )
+        assert ('api_db_queries_count{route="api:posts-detail",'
+                'method="GET"} 1') in text
+        assert ('api_response_size_bytes_bucket{route="api:posts-list",'
+                'method="GET",le="+Inf"} 2') in text
+        assert '# TYPE api_serializer_duration_seconds histogram' in text
+
+    def test_metrics_hidden(self, client):
+        response = client.get(self.metrics_url, REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что метрики недоступны адресам не из '
+            '`METRICS_ALLOWED_IPS`.'
+        )
+
+    def test_disabled(self, settings, client, post):
+        settings.METRICS_ENABLED = False
+        response = client.get(self.post_list_url)
+        assert 'Server-Timing' not in response
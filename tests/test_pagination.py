@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestKeysetPagination:
+
+    post_list_url = '/api/v1/posts/'
+    comment_list_url = '/api/v1/posts/{post_id}/comments/'
+
+    def walk(self, client, url):
+        ids = []
+        url = f'{url}?cursor=&limit=2'
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` с параметром `cursor` '
+                'возвращает ответ со статусом 200.'
+            )
+            test_data = response.json()
+            assert 'results' in test_data and 'next' in test_data, (
+                'Проверьте, что ответ с параметром `cursor` содержит поля '
+                '`results` и `next`.'
+            )
+            assert len(test_data['results']) <= 2
+            ids.extend(item['id'] for item in test_data['results'])
+            url = test_data['next']
+        return ids
+
+    def test_post_cursor_walk(self, client, user):
+        posts = [
+            Post.objects.create(text=f'Пост {number}', author=user)
+            for number in range(5)
+        ]
+
+        ids = self.walk(client, self.post_list_url)
+        assert ids == [post.id for post in posts], (
+            'Проверьте, что постраничный обход постов по курсору возвращает '
+            'все посты по одному разу в порядке (`pub_date`, `id`).'
+        )
+
+    def test_post_cursor_stable_under_inserts(self, client, user):
+        for number in range(4):
+            Post.objects.create(text=f'Пост {number}', author=user)
+
+        response = client.get(f'{self.post_list_url}?cursor=&limit=2')
+        first_page = [item['id'] for item in response.json()['results']]
+        new_post = Post.objects.create(text='Новый пост', author=user)
+        rest = self.walk_from(client, response.json()['next'])
+
+        assert first_page + rest == list(
+            Post.objects.order_by('pub_date', 'id').values_list(
+                'id', flat=True)
+        ), (
+            'Проверьте, что вставка постов во время обхода по курсору не '
+            'приводит к пропускам и повторам.'
+        )
+        assert rest[-1] == new_post.id
+
+    def walk_from(self, client, url):
+        ids = []
+        while url:
+            test_data = client.get(url).json()
+            ids.extend(item['id'] for item in test_data['results'])
+            url = test_data['next']
+        return ids
+
+    def test_comment_cursor_walk(self, client, post, user):
+        comments = [
+            Comment.objects.create(author=user, post=post, text=f'К {number}')
+            for number in range(3)
+        ]
+
+        ids = self.walk(client, self.comment_list_url.format(post_id=post.id))
+        assert ids == [comment.id for comment in comments], (
+            'Проверьте, что постраничный обход комментариев по курсору '
+            'возвращает все комментарии в порядке (`created`, `id`).'
+        )
+
+    def test_invalid_cursor(self, client, post):
+        response = client.get(f'{self.post_list_url}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что неверный курсор возвращает ответ со статусом 404.'
+        )
+
+    def test_limit_offset_kept(self, client, post, post_2):
+        response = client.get(f'{self.post_list_url}?limit=1&offset=1')
+        assert 'count' in response.json(), (
+            'Проверьте, что без параметра `cursor` сохраняется пагинация '
+            '`limit` и `offset`.'
+        )
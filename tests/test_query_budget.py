@@ -0,0 +1,68 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryBudget:
+
+    post_list_url = '/api/v1/posts/'
+    comment_list_url = '/api/v1/posts/{post_id}/comments/'
+    follow_url = '/api/v1/follow/'
+    objects_count = 10
+
+    @pytest.fixture
+    def authors(self, django_user_model):
+        return [
+            django_user_model.objects.create_user(
+                username=f'Author{number}', password='1234567'
+            )
+            for number in range(self.objects_count)
+        ]
+
+    def test_post_list_queries(self, client, authors, group_1,
+                               django_assert_max_num_queries):
+        for author in authors:
+            Post.objects.create(text='Текст', author=author, group=group_1)
+
+        with django_assert_max_num_queries(1):
+            response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_max_num_queries(2):
+            response = client.get(f'{self.post_list_url}?limit=5&offset=2')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.post_list_url}` загружает '
+            'авторов постов одним запросом, а не по запросу на пост.'
+        )
+
+    def test_comment_list_queries(self, client, authors, post,
+                                  django_assert_max_num_queries):
+        for author in authors:
+            Comment.objects.create(author=author, post=post, text='Коммент')
+
+        with django_assert_max_num_queries(2):
+            response = client.get(
+                self.comment_list_url.format(post_id=post.id))
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.comment_list_url}` загружает '
+            'авторов комментариев одним запросом, а не по запросу на '
+            'комментарий.'
+        )
+
+    def test_follow_list_queries(self, user_client, user, authors,
+                                 django_assert_max_num_queries):
+        for author in authors:
+            Follow.objects.create(user=user, following=author)
+        # Фильтр отозванных токенов загружается первым запросом процесса.
+        user_client.get(self.follow_url)
+
+        # Один запрос на пользователя из токена и один на подписки.
+        with django_assert_max_num_queries(2):
+            response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.follow_url}` загружает '
+            'пользователей подписок одним запросом, а не по запросу на '
+            'подписку.'
+        )
@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+
+from api.query_inspector import fingerprint, inspect_queries
+from posts.models import Comment, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryInspector:
+
+    objects_count = 5
+    endpoints = (
+        '/api/v1/posts/',
+        '/api/v1/posts/?cursor=',
+        '/api/v1/posts/?expand=group,comments',
+        '/api/v1/posts/{post_id}/comments/',
+        '/api/v1/groups/',
+        '/api/v1/follow/',
+        '/api/v1/feed/',
+    )
+
+    @pytest.fixture
+    def data(self, django_user_model, user, group_1):
+        post = None
+        for number in range(self.objects_count):
+            author = django_user_model.objects.create_user(
+                username=f'Author{number}', password='1234567')
+            Follow.objects.create(user=user, following=author)
+            post = Post.objects.create(text='Текст', author=author,
+                                       group=group_1)
+            Comment.objects.create(author=author, post=post, text='К')
+        return post
+
+    @pytest.mark.parametrize('url', endpoints)
+    def test_endpoint_without_n_plus_one(self, user_client, data, url,
+                                         assert_query_budget):
+        with assert_query_budget(max_queries=5, max_repeats=1):
+            response = user_client.get(url.format(post_id=data.id))
+        assert response.status_code == 200, url
+
+    def test_n_plus_one_detected(self, data, assert_query_budget):
+        with pytest.raises(AssertionError, match='повторён'):
+            with assert_query_budget(max_repeats=1):
+                [post.author.username for post in Post.objects.all()]
+
+    def test_max_queries(self, data, assert_query_budget):
+        with pytest.raises(AssertionError, match='допустимо 1'):
+            with assert_query_budget(max_queries=1):
+                list(Post.objects.all())
+                list(Comment.objects.all())
+
+    def test_middleware_logs(self, settings, client, data, caplog):
+        settings.QUERY_INSPECTOR = True
+        settings.QUERY_REPEAT_LIMIT = 1
+        settings.SLOW_QUERY_SECONDS = 0
+        with caplog.at_level(logging.WARNING, logger='api.query_inspector'):
+            client.get('/api/v1/groups/')
+        assert 'Медленный запрос' in caplog.text, (
+            'Проверьте, что медленные запросы пишутся в лог при '
+            '`QUERY_INSPECTOR`.'
+        )
+
+    def test_repeated_shapes(self, data):
+        with inspect_queries() as inspector:
+            for post in Post.objects.all():
+                post.author
+        (shape, count, stack), = inspector.repeated(1)
+        assert count == self.objects_count
+        assert 'test_query_inspector.py' in stack, (
+            'Проверьте, что в отчёт попадает место вызова запроса.'
+        )
+
+
+def test_fingerprint():
+    assert fingerprint(
+        "SELECT * FROM t WHERE id IN (%s, %s, %s) AND a = 'x''y' LIMIT 21"
+    ) == fingerprint(
+        "SELECT  *  FROM t WHERE id IN (%s) AND a = 'z' LIMIT 5"
+    ) == 'SELECT * FROM t WHERE id IN (...) AND a = ? LIMIT ?', (
+        'Проверьте, что форма запроса не зависит от значений и длины IN.'
+    )
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from api.renderers import FastJSONRenderer
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFastJSONRenderer:
+
+    post_list_url = '/api/v1/posts/'
+
+    def test_same_body_as_json_renderer(self, client, post, post_2):
+        response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.content == JSONRenderer().render(response.data), (
+            'Проверьте, что тело ответа совпадает с ответом стандартного '
+            '`JSONRenderer`.'
+        )
+
+    def test_native_types(self):
+        data = {
+            'pub_date': datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+            'price': Decimal('1.50'),
+            'text': 'Пост',
+        }
+        assert FastJSONRenderer().render(data) == (
+            '{"pub_date":"2024-05-01T12:30:00Z","price":1.5,"text":"Пост"}'
+        ).encode(), (
+            'Проверьте, что даты выводятся в UTC с суффиксом Z, а Decimal '
+            'числом, как у стандартного рендерера.'
+        )
+
+    def test_stdlib_fallback(self, settings):
+        settings.JSON_RENDERER_BACKEND = 'json'
+        data = {'text': 'Пост', 'id': 1}
+        assert FastJSONRenderer().render(data) == (
+            JSONRenderer().render(data)
+        ), 'Проверьте, что без orjson используется стандартный рендерер.'
+
+    def test_indent_fallback(self):
+        body = FastJSONRenderer().render(
+            {'id': 1}, 'application/json; indent=4')
+        assert body == b'{\n    "id": 1\n}', (
+            'Проверьте, что ответ с отступами строит стандартный рендерер.'
+        )
@@ -0,0 +1,125 @@
+import sqlite3
+import time
+from http import HTTPStatus
+
+from django.core.cache import caches
+from django.db import connections
+import pytest
+
+from posts.models import Follow, Post
+from yatube_api.db_router import PIN_KEY, ReplicaRouter, replica_reads
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    post_list_url = '/api/v1/posts/'
+    comment_list_url = '/api/v1/posts/{post_id}/comments/'
+    follow_url = '/api/v1/follow/'
+
+    @pytest.fixture
+    def replica(self, settings, tmp_path):
+        """Реплика в отдельном файле SQLite.
+
+        Копия основной базы при создании и при каждом вызове sync(),
+        между вызовами реплика отстаёт.
+        """
+        path = tmp_path / 'replica.sqlite3'
+        connections.databases['replica'] = {
+            **connections.databases['default'], 'NAME': str(path),
+        }
+        settings.DATABASE_REPLICAS = ['replica']
+
+        def sync():
+            primary = connections['default']
+            primary.ensure_connection()
+            target = sqlite3.connect(path)
+            primary.connection.backup(target)
+            target.close()
+        sync()
+        yield sync
+        connections['replica'].close()
+        del connections['replica']
+        del connections.databases['replica']
+
+    def get_following(self, client):
+        response = client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.OK
+        return [item['following'] for item in response.json()]
+
+    def test_router(self, settings):
+        settings.DATABASE_REPLICAS = ['replica']
+        router = ReplicaRouter()
+        assert router.db_for_read(None) is None
+        with replica_reads():
+            assert router.db_for_read(None) == 'replica', (
+                'Проверьте, что внутри `replica_reads()` чтение идёт с '
+                'реплики.'
+            )
+            assert router.db_for_write(None) == 'default', (
+                'Проверьте, что запись всегда идёт в основную базу.'
+            )
+        assert router.db_for_read(None) is None
+
+    def test_get_reads_replica(self, user_client, user, another_user,
+                               replica):
+        Follow.objects.create(user=user, following=another_user)
+        assert self.get_following(user_client) == [], (
+            'Проверьте, что GET-запрос к подпискам читает с реплики.'
+        )
+        replica()
+        assert self.get_following(user_client) == [another_user.username]
+
+    def test_versioned_reads_after_change(self, settings, client, user,
+                                          replica):
+        settings.DATABASE_REPLICA_PIN_SECONDS = 0.01
+        post = Post.objects.create(text='Новый пост', author=user)
+        response = client.get(self.post_list_url)
+        assert [item['id'] for item in response.json()] == [post.id], (
+            'Проверьте, что после смены версии коллекции ответы с ETag и '
+            'кэшем читаются с основной базы.'
+        )
+
+        time.sleep(0.05)
+        response = client.get(f'{self.post_list_url}?fields=id')
+        assert response.json() == [], (
+            'Проверьте, что после окончания привязки коллекции посты '
+            'снова читаются с реплики.'
+        )
+
+    def test_read_your_writes(self, user_client, another_user, replica):
+        response = user_client.post(self.follow_url,
+                                    data={'following': another_user.username})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что при записи чтение идёт с основной базы.'
+        )
+        assert self.get_following(user_client) == [another_user.username], (
+            'Проверьте, что после записи пользователь читает с основной '
+            'базы в течение `DATABASE_REPLICA_PIN_SECONDS`.'
+        )
+
+    def test_pin_expires(self, settings, user_client, another_user,
+                         replica):
+        settings.DATABASE_REPLICA_PIN_SECONDS = 0.01
+        user_client.post(self.follow_url,
+                         data={'following': another_user.username})
+
+        time.sleep(0.05)
+        assert self.get_following(user_client) == [], (
+            'Проверьте, что после окончания привязки чтение снова идёт с '
+            'реплики.'
+        )
+
+    def test_pin_cache(self, settings, user_client, user, another_user):
+        settings.CACHES = {**settings.CACHES, 'pins': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'pins',
+        }}
+        settings.DATABASE_REPLICA_PIN_CACHE = 'pins'
+        user_client.post(self.follow_url,
+                         data={'following': another_user.username})
+        key = PIN_KEY.format(user_id=user.id)
+        assert caches['pins'].get(key) and not caches['default'].get(key), (
+            'Проверьте, что привязка к основной базе хранится в кэше '
+            '`DATABASE_REPLICA_PIN_CACHE`.'
+        )
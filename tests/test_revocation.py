@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from api.revocation import BloomFilter
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(1000, 0.01)
+    items = [f'jti-{number}' for number in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items), (
+        'Проверьте, что фильтр Блума не даёт ложноотрицательных ответов.'
+    )
+    false_positives = sum(f'other-{number}' in bloom
+                          for number in range(1000))
+    assert false_positives < 50
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenRevocation:
+
+    revoke_url = '/api/v1/jwt/revoke/'
+    refresh_url = '/api/v1/jwt/refresh/'
+    verify_url = '/api/v1/jwt/verify/'
+    follow_url = '/api/v1/follow/'
+
+    def test_revoke_access(self, client, user_client, token):
+        response = client.post(self.revoke_url,
+                               data={'token': token['access']})
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            f'Проверьте, что POST-запрос к `{self.revoke_url}` с '
+            'действительным токеном возвращает ответ со статусом 204.'
+        )
+        response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что отозванный токен больше не принимается.'
+        )
+        response = client.post(self.verify_url,
+                               data={'token': token['access']})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что `{self.verify_url}` отклоняет отозванный токен.'
+        )
+
+    def test_revoke_refresh(self, client, token):
+        client.post(self.revoke_url, data={'token': token['refresh']})
+        response = client.post(self.refresh_url,
+                               data={'refresh': token['refresh']})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            f'Проверьте, что `{self.refresh_url}` не обновляет отозванный '
+            'refresh-токен.'
+        )
+
+    def test_revoke_invalid(self, client):
+        response = client.post(self.revoke_url, data={'token': 'broken'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.revoke_url}` с '
+            'недействительным токеном возвращает ответ со статусом 400.'
+        )
+
+    def test_check_without_queries(self, user_client, follow_1,
+                                   django_assert_num_queries):
+        user_client.get(self.follow_url)
+        with django_assert_num_queries(1):
+            response = user_client.get(self.follow_url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что проверка неотозванного токена не обращается к '
+            'базе.'
+        )
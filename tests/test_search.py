@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+import pytest
+
+from posts.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPostSearch:
+
+    url = '/api/v1/posts/'
+
+    def search(self, client, query, params=''):
+        response = client.get(f'{self.url}?search={query}{params}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с параметром '
+            '`search` возвращает ответ со статусом 200.'
+        )
+        return response.json()
+
+    def test_search_text_and_comments(self, client, user):
+        post = Post.objects.create(text='Рецепт борща', author=user)
+        commented = Post.objects.create(text='Обед', author=user)
+        Comment.objects.create(author=user, post=commented,
+                               text='Лучше борща ничего нет')
+        Post.objects.create(text='Про котов', author=user)
+
+        ids = {item['id'] for item in self.search(client, 'борща')}
+        assert ids == {post.id, commented.id}, (
+            'Проверьте, что поиск находит посты по тексту поста и по тексту '
+            'комментариев.'
+        )
+
+    def test_search_ranking(self, client, user):
+        Post.objects.create(text='кот и собака и попугай и рыбки',
+                            author=user)
+        best = Post.objects.create(text='кот кот кот', author=user)
+        assert self.search(client, 'кот')[0]['id'] == best.id, (
+            'Проверьте, что результаты поиска упорядочены по релевантности.'
+        )
+
+    def test_search_sync(self, client, post):
+        post.text = 'Совсем новый текст'
+        post.save()
+        assert self.search(client, 'новый')[0]['id'] == post.id, (
+            'Проверьте, что поиск видит изменённый текст поста.'
+        )
+        assert self.search(client, 'Тестовый') == []
+        post.delete()
+        assert self.search(client, 'новый') == []
+
+    def test_search_pagination(self, client, user):
+        for number in range(5):
+            Post.objects.create(text=f'Слово {number}', author=user)
+        test_data = self.search(client, 'слово', '&limit=2&offset=2')
+        assert test_data['count'] == 5, (
+            'Проверьте, что поиск поддерживает пагинацию `limit` и `offset`.'
+        )
+        assert len(test_data['results']) == 2
+
+    def test_search_special_chars(self, client, post):
+        assert self.search(client, '"*:(') == []
@@ -0,0 +1,85 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F, Sum
+import pytest
+
+from posts.management.commands.seed_data import PASSWORD
+from posts.models import Comment, Follow, Group, Post, Profile
+
+User = get_user_model()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSeedData:
+
+    options = {
+        'users': 20,
+        'groups': 3,
+        'posts': 50,
+        'comments': 200,
+        'follows': 3,
+        'workers': 1,
+        'chunk_size': 16,
+    }
+
+    def seed(self, **options):
+        call_command('seed_data', stdout=StringIO(),
+                     **{**self.options, **options})
+
+    def snapshot(self):
+        return (
+            list(Post.objects.order_by('pub_date').values_list(
+                'text', 'author__username', 'group__slug')),
+            list(Comment.objects.order_by('created').values_list(
+                'text', 'author__username', 'post__text')),
+            sorted(Follow.objects.values_list(
+                'user__username', 'following__username')),
+        )
+
+    def test_seed_data(self):
+        self.seed()
+        assert User.objects.count() == 20, (
+            'Проверьте, что команда `seed_data` создаёт `--users` '
+            'пользователей.'
+        )
+        assert (Group.objects.count(), Post.objects.count(),
+                Comment.objects.count()) == (3, 50, 200), (
+            'Проверьте, что команда `seed_data` создаёт заданное число '
+            'групп, постов и комментариев.'
+        )
+        assert User.objects.first().check_password(PASSWORD), (
+            'Проверьте, что у пользователей `seed_data` общий пароль '
+            '`PASSWORD`.'
+        )
+        assert not Follow.objects.filter(user=F('following')).exists(), (
+            'Проверьте, что `seed_data` не создаёт подписок на себя.'
+        )
+        comments = Post.objects.aggregate(total=Sum('comment_count'))
+        assert comments['total'] == 200, (
+            'Проверьте, что `seed_data` пересчитывает `comment_count`.'
+        )
+        followers = Profile.objects.aggregate(total=Sum('follower_count'))
+        assert followers['total'] == Follow.objects.count(), (
+            'Проверьте, что `seed_data` пересчитывает `follower_count`.'
+        )
+
+    def test_seed_data_deterministic(self):
+        self.seed()
+        first = self.snapshot()
+        Comment.objects.all().delete()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        self.seed()
+        assert self.snapshot() == first, (
+            'Проверьте, что `seed_data` с одинаковым `--seed` создаёт '
+            'одинаковые данные.'
+        )
+        Comment.objects.all().delete()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        self.seed(seed=2)
+        assert self.snapshot() != first, (
+            'Проверьте, что `--seed` меняет данные `seed_data`.'
+        )
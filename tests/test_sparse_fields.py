@@ -0,0 +1,119 @@
+from http import HTTPStatus
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+
+from posts.models import Comment, Follow, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSparseFields:
+
+    post_list_url = '/api/v1/posts/'
+    post_detail_url = '/api/v1/posts/{post_id}/'
+    comment_list_url = '/api/v1/posts/{post_id}/comments/'
+    feed_url = '/api/v1/feed/'
+
+    def test_post_fields(self, client, post):
+        response = client.get(f'{self.post_list_url}?fields=id,author,text')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == [{
+            'id': post.id, 'author': post.author.username, 'text': post.text,
+        }], (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля публикации.'
+        )
+
+    def test_unknown_fields_ignored(self, client, post):
+        response = client.get(
+            self.post_detail_url.format(post_id=post.id) + '?fields=id,nope')
+        assert response.json() == {'id': post.id}, (
+            'Проверьте, что неизвестные имена в параметре `fields` '
+            'пропускаются.'
+        )
+
+    def test_expand_group_and_comments(self, client, user, post, group_1,
+                                       django_assert_max_num_queries):
+        for number in range(3):
+            Comment.objects.create(author=user, post=post, text=f'К {number}')
+            Post.objects.create(text=f'Пост {number}', author=user,
+                                group=group_1)
+
+        with django_assert_max_num_queries(2):
+            response = client.get(
+                f'{self.post_list_url}?expand=group,comments')
+        assert response.status_code == HTTPStatus.OK
+        data = {item['id']: item for item in response.json()}
+        assert data[post.id]['group'] == {
+            'id': group_1.id, 'title': group_1.title, 'slug': group_1.slug,
+            'description': group_1.description,
+        }, 'Проверьте, что `expand=group` выдаёт группу объектом.'
+        assert [comment['text'] for comment in data[post.id]['comments']] == [
+            'К 0', 'К 1', 'К 2'
+        ], 'Проверьте, что `expand=comments` выдаёт комментарии публикации.'
+        assert data[post.id]['comments'][0]['author'] == user.username
+
+    def test_expand_group_invalidated(self, client, post, group_1):
+        url = f'{self.post_list_url}?expand=group'
+        response = client.get(url)
+        etag = response['ETag']
+        group_1.title = 'Новое название'
+        group_1.save()
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение группы меняет ETag постов.'
+        )
+        assert response.json()[0]['group']['title'] == 'Новое название', (
+            'Проверьте, что изменение группы сбрасывает кэш постов с '
+            '`expand=group`.'
+        )
+
+    def test_expand_with_fields(self, client, post):
+        response = client.get(
+            self.post_detail_url.format(post_id=post.id)
+            + '?fields=id&expand=group')
+        assert set(response.json()) == {'id', 'group'}, (
+            'Проверьте, что раскрытые связи выдаются вместе с полями из '
+            '`fields`.'
+        )
+
+    def test_fields_ignored_on_write(self, user_client, group_1):
+        response = user_client.post(
+            f'{self.post_list_url}?fields=id',
+            data={'text': 'Новый пост', 'group': group_1.id})
+        assert response.status_code == HTTPStatus.CREATED
+        assert 'text' in response.json(), (
+            'Проверьте, что параметр `fields` не влияет на создание '
+            'публикаций.'
+        )
+
+    def test_comment_fields(self, client, comment_1_post):
+        response = client.get(
+            self.comment_list_url.format(post_id=comment_1_post.post_id)
+            + '?fields=id,text')
+        assert response.json() == [{
+            'id': comment_1_post.id, 'text': comment_1_post.text,
+        }], (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля комментария.'
+        )
+
+    def test_unknown_fields_queries(self, user_client, user, another_user):
+        Follow.objects.create(user=user, following=another_user)
+        for number in range(5):
+            Post.objects.create(text=f'Пост {number}', author=another_user)
+
+        queries = []
+        for url in (self.feed_url, f'{self.feed_url}?fields=bogus'):
+            with CaptureQueriesContext(connection) as context:
+                response = user_client.get(url)
+            queries.append(len(context))
+        assert len(response.json()) == 5 and 'text' in response.json()[0], (
+            'Проверьте, что `fields` без известных полей выдаёт все поля.'
+        )
+        assert queries[1] <= queries[0], (
+            'Проверьте, что `fields` без известных полей не откладывает '
+            'загрузку полей до запроса на каждую публикацию.'
+        )
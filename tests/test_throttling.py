@@ -0,0 +1,136 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+
+from api import throttling
+from api.throttling import (CacheBucketStore, FileLockBucketStore,
+                            MemoryBucketStore, take_token)
+from posts.models import Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTokenBucketThrottle:
+
+    post_list_url = '/api/v1/posts/'
+    post_bulk_url = '/api/v1/posts/bulk/'
+
+    @pytest.fixture
+    def rates(self, settings):
+        """Маленькие частоты для постов."""
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'posts_user': '2/min', 'posts_ip': '3/min',
+                'posts_bulk_user': '2/min', 'posts_bulk_ip': '3/min',
+            },
+        }
+
+    def create_post(self, client):
+        return client.post(self.post_list_url, data={'text': 'Пост'})
+
+    def test_user_bucket(self, rates, user_client):
+        assert [self.create_post(user_client).status_code
+                for _ in range(3)] == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        ], (
+            'Проверьте, что после исчерпания ведра пользователя создание '
+            'поста возвращает ответ со статусом 429.'
+        )
+        response = self.create_post(user_client)
+        assert 0 < int(response['Retry-After']) <= 30, (
+            'Проверьте, что ответ 429 содержит время до следующего токена.'
+        )
+        assert user_client.get(self.post_list_url).status_code == (
+            HTTPStatus.OK
+        ), 'Проверьте, что ограничение не действует на чтение.'
+
+    def test_ip_bucket(self, rates, user_client, token, another_user):
+        from rest_framework.test import APIClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        another_client = APIClient()
+        another_client.credentials(HTTP_AUTHORIZATION=(
+            f'Bearer {RefreshToken.for_user(another_user).access_token}'))
+        statuses = [self.create_post(client).status_code for client in (
+            user_client, user_client, another_client, another_client)]
+        assert statuses == [HTTPStatus.CREATED] * 3 + [
+            HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            'Проверьте, что запросы разных пользователей с одного адреса '
+            'ограничиваются общим ведром.'
+        )
+
+    def test_refill(self, rates, user_client, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(throttling.time, 'time', lambda: now[0])
+        for _ in range(2):
+            self.create_post(user_client)
+        assert self.create_post(user_client).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        now[0] += 30
+        assert self.create_post(user_client).status_code == (
+            HTTPStatus.CREATED
+        ), 'Проверьте, что ведро пополняется равномерно за период.'
+
+    def test_bulk_scope(self, rates, settings, user_client):
+        settings.BULK_BATCH_SIZE = 100
+        statuses = [user_client.post(self.post_bulk_url, data=[
+            {'text': f'Пост {number}'} for number in range(200)
+        ], format='json').status_code for _ in range(3)]
+        assert statuses == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED,
+            HTTPStatus.TOO_MANY_REQUESTS,
+        ], (
+            'Проверьте, что пакетное создание ограничивается частотой '
+            '`posts_bulk_user` по запросам, а не по объектам.'
+        )
+        assert Post.objects.count() == 400
+        assert self.create_post(user_client).status_code == (
+            HTTPStatus.CREATED
+        ), (
+            'Проверьте, что пакеты и обычное создание постов используют '
+            'разные вёдра.'
+        )
+
+
+def test_take_token():
+    state, wait = take_token(None, capacity=2, refill=1.0, now=0)
+    assert (state, wait) == ((1, 0), 0)
+    state, wait = take_token(state, capacity=2, refill=1.0, now=0)
+    state, wait = take_token(state, capacity=2, refill=1.0, now=0.5)
+    assert wait == 0.5, 'Проверьте время ожидания следующего токена.'
+
+
+@pytest.mark.parametrize('store_class', (
+    MemoryBucketStore, CacheBucketStore, FileLockBucketStore,
+))
+def test_stores(store_class, tmp_path):
+    store = (store_class(tmp_path) if store_class is FileLockBucketStore
+             else store_class())
+    take = lambda state: take_token(state, 1, 0.001, 0)  # noqa: E731
+    assert store.update('test-store-key', take, 60) == 0
+    assert store.update('test-store-key', take, 60) > 0, (
+        f'Проверьте, что `{store_class.__name__}` сохраняет состояние ведра.'
+    )
+
+
+def test_cache_store_atomic():
+    store = CacheBucketStore()
+
+    def take(state):
+        state, wait = take_token(state, 5, 0.001, 0)
+        # Окно между чтением и записью ведра.
+        time.sleep(0.005)
+        return state, wait
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        waits = list(executor.map(
+            lambda _: store.update('test-atomic-key', take, 60), range(20)))
+    assert waits.count(0) == 5, (
+        'Проверьте, что `CacheBucketStore` меняет ведро атомарно и '
+        'одновременные запросы не получают лишних токенов.'
+    )
@@ -0,0 +1,96 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.serializers import (CommentSerializer, FollowSerializer,
+                             GroupSerializer, PostSerializer)
+from posts.models import Comment, Follow, Group, Post
+
+
+@pytest.mark.django_db(transaction=True)
+class TestValuesList:
+
+    post_list_url = '/api/v1/posts/'
+    comment_list_url = '/api/v1/posts/{post_id}/comments/'
+    group_list_url = '/api/v1/groups/'
+    follow_url = '/api/v1/follow/'
+
+    def serialize(self, serializer_class, queryset, url):
+        """Ответ сериализатора для сравнения с ответом API."""
+        request = Request(APIRequestFactory().get(url))
+        data = serializer_class(queryset, many=True,
+                                context={'request': request}).data
+        return json.loads(JSONRenderer().render(data))
+
+    def check_same(self, response, expected, url):
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data == expected, (
+            f'Проверьте, что список `{url}` совпадает с ответом сериализатора.'
+        )
+        assert [list(item) for item in data] == [
+            list(item) for item in expected
+        ], f'Проверьте, что порядок полей в `{url}` как у сериализатора.'
+
+    def test_posts_same_as_serializer(self, client, user, post, group_1):
+        Post.objects.create(
+            text='Без группы', author=user, image='posts/a.jpg',
+            image_variants={'320': '/media/a-320.jpg'})
+
+        response = client.get(self.post_list_url)
+        expected = self.serialize(PostSerializer, Post.objects.all(),
+                                  self.post_list_url)
+        self.check_same(response, expected, self.post_list_url)
+        assert expected[1]['image'].startswith('http://testserver/')
+
+    def test_comments_same_as_serializer(self, client, comment_1_post,
+                                         comment_2_post):
+        url = self.comment_list_url.format(post_id=comment_1_post.post_id)
+        self.check_same(client.get(url), self.serialize(
+            CommentSerializer, Comment.objects.all(), url), url)
+
+    def test_groups_same_as_serializer(self, client, group_1, group_2):
+        Group.objects.filter(pk=group_2.pk).update(description='Описание')
+        self.check_same(client.get(self.group_list_url), self.serialize(
+            GroupSerializer, Group.objects.all(), self.group_list_url
+        ), self.group_list_url)
+
+    def test_follows_same_as_serializer(self, user_client, user, user_2,
+                                        another_user):
+        Follow.objects.create(user=user, following=user_2)
+        Follow.objects.create(user=user, following=another_user)
+        self.check_same(user_client.get(self.follow_url), self.serialize(
+            FollowSerializer, Follow.objects.filter(user=user),
+            self.follow_url
+        ), self.follow_url)
+
+    def test_paginated_and_sparse(self, client, post, post_2):
+        response = client.get(f'{self.post_list_url}?limit=1&offset=1'
+                              '&fields=id,text')
+        assert response.json()['results'] == [
+            {'id': post_2.id, 'text': post_2.text}
+        ], (
+            'Проверьте, что пагинация и параметр `fields` работают при '
+            'выводе списка без сериализатора.'
+        )
+
+    def test_serializer_not_used(self, client, post, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError
+        monkeypatch.setattr(PostSerializer, 'to_representation', fail)
+
+        response = client.get(self.post_list_url)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что список постов выводится без '
+            '`PostSerializer.to_representation`.'
+        )
+
+    def test_expand_uses_serializer(self, client, post):
+        response = client.get(f'{self.post_list_url}?expand=group')
+        assert response.json()[0]['group']['id'] == post.group_id, (
+            'Проверьте, что раскрытые связи выводятся сериализатором.'
+        )
@@ -6,3 +6,8 @@ from django.apps import AppConfig  # type: ignore
 class ApiConfig(AppConfig):
     name = 'api'
     verbose_name = 'API'
+
+    def ready(self):
+        """Подключение сигналов."""
+        from yatube_api import database  # noqa: F401
+        from . import metrics, query_inspector, signals  # noqa: F401
@@ -0,0 +1,80 @@
+"""Асинхронный вход в синхронные представления для ASGI.
+
+В Django 3.2 нет асинхронного ORM, а DRF не поддерживает асинхронные
+представления. Под ASGI Django выполняет синхронные представления по
+одному в общем потоке, поэтому медленный запрос задерживает остальные.
+Здесь представление вызывается из корутины, а чтение выполняется в
+отдельном пуле потоков, каждый со своим соединением с базой.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async  # type: ignore
+from django.conf import settings  # type: ignore
+from django.db import close_old_connections  # type: ignore
+from rest_framework.permissions import SAFE_METHODS  # type: ignore
+
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Пул потоков чтения, создаётся при первом обращении."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_READ_WORKERS,
+            thread_name_prefix='api-read')
+    return _executor
+
+
+def run_in_thread(view, request, *args, **kwargs):
+    """Вызов представления в потоке пула с готовым телом ответа.
+
+    Пул живёт дольше запроса, поэтому устаревшие соединения закрываются
+    здесь, как это делает Django в начале и в конце запроса.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def call_blocking(func, *args):
+    """Синхронный вызов с ORM и из цикла событий ASGI.
+
+    В цикле событий ORM запрещён, поэтому func выполняется в потоке
+    пула, а цикл ждёт результата. Так Django 3.2 перебирает потоковые
+    ответы: тело ответа читается прямо в цикле событий.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return func(*args)
+
+    def call():
+        close_old_connections()
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    context = contextvars.copy_context()
+    return get_executor().submit(context.run, call).result()
+
+
+def async_read_view(view):
+    """Асинхронная обёртка: чтение в пуле, запись в общем потоке."""
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            handler = sync_to_async(run_in_thread, thread_sensitive=False,
+                                    executor=get_executor())
+            return await handler(view, request, *args, **kwargs)
+        return await sync_to_async(view)(request, *args, **kwargs)
+    return async_view
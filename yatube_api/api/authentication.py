@@ -0,0 +1,71 @@
+"""Аутентификация."""
+
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.db import DEFAULT_DB_ALIAS  # type: ignore
+from django.utils.translation import gettext_lazy as _  # type: ignore
+from rest_framework_simplejwt.authentication import (  # type: ignore
+    JWTAuthentication)
+from rest_framework_simplejwt.exceptions import (  # type: ignore
+    AuthenticationFailed, InvalidToken)
+from rest_framework_simplejwt.settings import api_settings  # type: ignore
+
+from .revocation import revocation_list
+
+USER_KEY = 'api:auth-user:{user_id}'
+# Поля пользователя, нужные представлениям и проверкам разрешений.
+USER_FIELDS = ('id', 'username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def invalidate_user(user_id) -> None:
+    """Удаление пользователя из кэша аутентификации."""
+    cache.delete(USER_KEY.format(user_id=user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запросов к базе.
+
+    Основные поля пользователя хранятся в кэше JWT_USER_CACHE_TIMEOUT
+    секунд, объект модели собирается из них, остальные поля загружаются
+    при обращении. Изменение или удаление пользователя сбрасывает запись
+    сигналом, поэтому блокировка действует сразу. Отзыв токена
+    проверяется по фильтру в памяти.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.field_names = tuple(
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in USER_FIELDS)
+
+    def get_validated_token(self, raw_token):
+        """Проверка токена и его отзыва."""
+        validated_token = super().get_validated_token(raw_token)
+        if revocation_list.is_revoked(
+                validated_token.get(api_settings.JTI_CLAIM, '')):
+            raise InvalidToken('Токен отозван.')
+        return validated_token
+
+    def get_user(self, validated_token):
+        """Пользователь из кэша или из базы с сохранением в кэш."""
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification'))
+        key = USER_KEY.format(user_id=user_id)
+        values = cache.get(key)
+        if values is None:
+            values = self.user_model.objects.filter(
+                **{api_settings.USER_ID_FIELD: user_id}
+            ).values_list(*self.field_names).first()
+            if values is None:
+                raise AuthenticationFailed(_('User not found'),
+                                           code='user_not_found')
+            cache.set(key, values, settings.JWT_USER_CACHE_TIMEOUT)
+        user = self.user_model.from_db(DEFAULT_DB_ALIAS, self.field_names,
+                                       values)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'),
+                                       code='user_inactive')
+        return user
@@ -0,0 +1,90 @@
+"""Кэш ответов API.
+
+Каждая коллекция (посты, группы, комментарии поста) имеет номер версии,
+который входит в ключ кэша ответа и в ETag. Изменение коллекции
+увеличивает версию, поэтому старые ответы больше не читаются и
+вытесняются по таймауту.
+"""
+
+import math
+import time
+from hashlib import md5
+
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+
+from yatube_api.db_router import pin_collection
+
+VERSION_KEY = 'api:version:{namespace}'
+CHANGED_KEY = 'api:changed:{namespace}'
+RESPONSE_KEY = 'api:response:{namespace}:{version}:{url}'
+
+
+def new_version() -> int:
+    """Начальная версия, не совпадающая с вытесненными."""
+    return time.time_ns()
+
+
+def get_version(namespace: str) -> int:
+    """Текущая версия коллекции."""
+    key = VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), timeout=None)
+        cache.add(CHANGED_KEY.format(namespace=namespace), time.time(),
+                  timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace: str) -> None:
+    """Новая версия коллекции после изменения."""
+    key = VERSION_KEY.format(namespace=namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_version(), timeout=None)
+    cache.set(CHANGED_KEY.format(namespace=namespace), time.time(),
+              timeout=None)
+    pin_collection(namespace)
+
+
+def get_last_modified(namespace: str):
+    """Время последнего изменения коллекции в целых секундах или None.
+
+    Секунды округляются вверх. Пока секунда изменения не закончилась,
+    возвращается None: запись в ту же секунду не изменила бы
+    Last-Modified, и клиент получил бы 304 со старыми данными.
+    """
+    changed = cache.get(CHANGED_KEY.format(namespace=namespace))
+    if changed is None or math.ceil(changed) > time.time():
+        return None
+    return math.ceil(changed)
+
+
+def get_etag(namespace: str, *parts: str) -> str:
+    """ETag ответа в текущей версии коллекции."""
+    value = ':'.join((namespace, str(get_version(namespace)), *parts))
+    return f'"{md5(value.encode()).hexdigest()}"'
+
+
+def get_response_key(namespace: str, url: str) -> str:
+    """Ключ ответа для полного адреса в текущей версии.
+
+    Схема и хост входят в ключ: ответ содержит абсолютные ссылки.
+    """
+    return RESPONSE_KEY.format(
+        namespace=namespace,
+        version=get_version(namespace),
+        url=md5(url.encode()).hexdigest(),
+    )
+
+
+def get_cached_data(key: str):
+    """Данные ответа из кэша."""
+    return cache.get(key)
+
+
+def set_cached_data(key: str, data) -> None:
+    """Сохранение данных ответа."""
+    cache.set(key, data, timeout=settings.API_CACHE_TIMEOUT)
@@ -0,0 +1,65 @@
+"""Выгрузка постов с комментариями в NDJSON.
+
+Посты читаются пакетами по возрастанию id, поэтому память не зависит от
+размера таблицы, а выгрузку можно продолжить с последнего id.
+"""
+
+import json
+from collections import defaultdict
+
+from django.core.files.storage import default_storage  # type: ignore
+from django.core.serializers.json import DjangoJSONEncoder  # type: ignore
+
+from posts.models import Comment, Post
+from .async_views import call_blocking
+
+POST_FIELDS = ('id', 'author__username', 'text', 'pub_date', 'image',
+               'image_variants', 'group', 'comment_count')
+COMMENT_FIELDS = ('id', 'author__username', 'post', 'text', 'created')
+
+
+def rename_author(row: dict) -> dict:
+    """Автор под именем поля API."""
+    row['author'] = row.pop('author__username')
+    return row
+
+
+def fetch_chunk(last_id: int, chunk_size: int) -> list:
+    """Пакет постов с комментариями после поста с id last_id."""
+    posts = [
+        rename_author(post) for post in
+        Post.objects.filter(id__gt=last_id).order_by('id')
+        .values(*POST_FIELDS)[:chunk_size]
+    ]
+    comments = defaultdict(list)
+    for comment in (
+            Comment.objects.filter(post__in=[post['id'] for post in posts])
+            .order_by('created', 'id').values(*COMMENT_FIELDS)
+            .iterator(chunk_size=chunk_size)):
+        comments[comment['post']].append(rename_author(comment))
+    for post in posts:
+        if post['image']:
+            post['image'] = default_storage.url(post['image'])
+        post['comments'] = comments[post['id']]
+    return posts
+
+
+def iter_posts(after: int = 0, chunk_size: int = 1000):
+    """Посты с комментариями после поста с id after.
+
+    Под ASGI пакеты читаются в потоке пула, см. call_blocking.
+    """
+    last_id = after
+    while True:
+        posts = call_blocking(fetch_chunk, last_id, chunk_size)
+        if not posts:
+            return
+        yield from posts
+        last_id = posts[-1]['id']
+
+
+def iter_ndjson(after: int = 0, chunk_size: int = 1000):
+    """Строки NDJSON, по одному посту на строку."""
+    for post in iter_posts(after, chunk_size):
+        yield json.dumps(post, cls=DjangoJSONEncoder,
+                         ensure_ascii=False) + '\n'
@@ -0,0 +1,29 @@
+"""Выгрузка постов с комментариями в NDJSON."""
+
+from django.conf import settings  # type: ignore
+from django.core.management.base import BaseCommand  # type: ignore
+
+from api.export import iter_ndjson
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты с комментариями в NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--after', type=int, default=0,
+            help='Продолжить после поста с этим id.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.EXPORT_CHUNK_SIZE,
+            help='Количество постов в одном запросе к базе.')
+        parser.add_argument(
+            '--output', help='Файл для записи, по умолчанию stdout.')
+
+    def handle(self, *args, **options):
+        lines = iter_ndjson(options['after'], options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            file.writelines(lines)
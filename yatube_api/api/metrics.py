@@ -0,0 +1,200 @@
+"""Метрики запросов: время, запросы к базе, сериализация и размер.
+
+Статистика запроса живёт в contextvar, поэтому её видят и потоки пула
+чтения под ASGI. Запросы к базе считает обёртка execute_wrapper,
+которая ставится на каждое новое соединение. Итоги копятся в
+гистограммах процесса и выдаются в текстовом формате Prometheus.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.backends.signals import connection_created  # type: ignore
+from django.dispatch import receiver  # type: ignore
+
+# Границы корзин гистограмм.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+_request_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Показатели одного запроса."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.timers: dict = {}
+        self.depth: dict = {}
+
+    @property
+    def duration(self) -> float:
+        """Время с начала запроса, секунды."""
+        return time.perf_counter() - self.started
+
+
+def start_request() -> RequestStats:
+    """Начало сбора показателей запроса."""
+    stats = RequestStats()
+    _request_stats.set(stats)
+    return stats
+
+
+def finish_request() -> None:
+    """Конец сбора показателей запроса."""
+    _request_stats.set(None)
+
+
+def get_request_stats():
+    """Показатели текущего запроса или None вне запроса."""
+    return _request_stats.get()
+
+
+@contextmanager
+def measure(name: str):
+    """Время блока в показателе name; вложенные блоки не суммируются."""
+    stats = _request_stats.get()
+    if stats is None:
+        yield
+        return
+    depth = stats.depth.get(name, 0)
+    stats.depth[name] = depth + 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.depth[name] = depth
+        if not depth:
+            stats.timers[name] = (stats.timers.get(name, 0.0)
+                                  + time.perf_counter() - started)
+
+
+def count_query(execute, sql, params, many, context):
+    """Обёртка соединения: число и время запросов к базе."""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    """Обёртка на каждое соединение, в том числе потоков пула."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+
+class Histogram:
+    """Гистограмма с накопительными корзинами по меткам."""
+
+    def __init__(self, name: str, help_text: str, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.series: dict = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        """Добавление значения в ряд с метками."""
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [
+                [0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self, label_names) -> list:
+        """Строки текстового формата Prometheus."""
+        lines = [f'# HELP {self.name} {self.help_text}',
+                 f'# TYPE {self.name} histogram']
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            label_text = ','.join(
+                f'{name}="{value}"' for name, value in zip(label_names,
+                                                           labels))
+            cumulative = 0
+            for bound, bucket_count in zip(
+                    (*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{label_text},'
+                             f'le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{self.name}_count{{{label_text}}} {count}')
+        return lines
+
+
+class Registry:
+    """Гистограммы API по маршруту и методу."""
+
+    label_names = ('route', 'method')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Пустые гистограммы."""
+        self.histograms = {
+            'duration': Histogram('api_request_duration_seconds',
+                                  'Время обработки запроса.',
+                                  DURATION_BUCKETS),
+            'queries': Histogram('api_db_queries',
+                                 'Число запросов к базе на запрос.',
+                                 QUERY_BUCKETS),
+            'db': Histogram('api_db_duration_seconds',
+                            'Время запросов к базе на запрос.',
+                            DURATION_BUCKETS),
+            'serializer': Histogram('api_serializer_duration_seconds',
+                                    'Время сериализации ответа.',
+                                    DURATION_BUCKETS),
+            'size': Histogram('api_response_size_bytes',
+                              'Размер тела ответа.', SIZE_BUCKETS),
+        }
+
+    def observe(self, route: str, method: str, stats: RequestStats,
+                duration: float, size) -> None:
+        """Показатели завершённого запроса."""
+        labels = (route, method)
+        values = {
+            'duration': duration,
+            'queries': stats.queries,
+            'db': stats.db_time,
+            'serializer': stats.timers.get('serializer', 0.0),
+            'size': size,
+        }
+        with self.lock:
+            for name, value in values.items():
+                if value is not None:
+                    self.histograms[name].observe(labels, value)
+
+    def render(self) -> str:
+        """Все гистограммы в текстовом формате Prometheus."""
+        with self.lock:
+            lines = []
+            for histogram in self.histograms.values():
+                lines.extend(histogram.render(self.label_names))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+def server_timing(stats: RequestStats, duration: float) -> str:
+    """Заголовок Server-Timing, длительности в миллисекундах."""
+    parts = [
+        f'total;dur={duration * 1000:.2f}',
+        f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries"',
+    ]
+    parts.extend(f'{name};dur={elapsed * 1000:.2f}'
+                 for name, elapsed in stats.timers.items())
+    return ', '.join(parts)
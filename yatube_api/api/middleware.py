@@ -0,0 +1,109 @@
+"""Промежуточные обработчики API."""
+
+import asyncio
+import logging
+
+from django.conf import settings  # type: ignore
+
+from .metrics import finish_request, registry, server_timing, start_request
+from .query_inspector import inspect_queries
+
+logger = logging.getLogger('api.query_inspector')
+
+
+class AsyncCapableMiddleware:
+    """Обработчик для синхронной и асинхронной цепочки.
+
+    Под ASGI Django выполнял бы синхронный обработчик и всё, что после
+    него, через sync_to_async в одном общем потоке, по запросу за раз.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Так Django и asyncio распознают асинхронный обработчик.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        """Синхронная обработка запроса."""
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        """Асинхронная обработка запроса."""
+        raise NotImplementedError
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """Показатели запроса по имени маршрута и заголовок Server-Timing.
+
+    Маршрут — имя из urls, например api:posts-list. Размер потокового
+    ответа неизвестен и в гистограмму не попадает.
+    """
+
+    def handle(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        stats = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            finish_request()
+        return self.process_response(request, response, stats)
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        stats = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            finish_request()
+        return self.process_response(request, response, stats)
+
+    def process_response(self, request, response, stats):
+        """Запись показателей и заголовок ответа."""
+        duration = stats.duration
+        match = request.resolver_match
+        route = match.view_name if match is not None else 'unresolved'
+        size = (None if response.streaming
+                else len(response.content))
+        registry.observe(route, request.method, stats, duration, size)
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = server_timing(stats, duration)
+        return response
+
+
+class QueryInspectorMiddleware(AsyncCapableMiddleware):
+    """Предупреждения о N+1 и медленных запросах при QUERY_INSPECTOR."""
+
+    def handle(self, request):
+        if not settings.QUERY_INSPECTOR:
+            return self.get_response(request)
+        with inspect_queries() as inspector:
+            response = self.get_response(request)
+        self.log_repeated(request, inspector)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.QUERY_INSPECTOR:
+            return await self.get_response(request)
+        with inspect_queries() as inspector:
+            response = await self.get_response(request)
+        self.log_repeated(request, inspector)
+        return response
+
+    def log_repeated(self, request, inspector):
+        """Предупреждения о повторах одной формы запроса."""
+        for shape, count, stack in inspector.repeated(
+                settings.QUERY_REPEAT_LIMIT):
+            logger.warning('N+1 в %s %s: %d запросов %s\n%s',
+                           request.method, request.path, count, shape,
+                           stack)
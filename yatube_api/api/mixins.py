@@ -0,0 +1,289 @@
+"""Миксины представлений."""
+
+from django.conf import settings  # type: ignore
+from django.core.exceptions import FieldDoesNotExist  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models import QuerySet  # type: ignore
+from django.utils.cache import get_conditional_response  # type: ignore
+from django.utils.http import http_date  # type: ignore
+from rest_framework import status  # type: ignore
+from rest_framework.decorators import action  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+from rest_framework.permissions import SAFE_METHODS  # type: ignore
+from rest_framework.relations import SlugRelatedField  # type: ignore
+from rest_framework.response import Response  # type: ignore
+
+from yatube_api.db_router import (disable_replica_reads,
+                                  enable_replica_reads,
+                                  is_collection_pinned, is_pinned,
+                                  pin_to_primary)
+
+from .async_views import async_read_view
+from .cache import (get_cached_data, get_etag, get_last_modified,
+                    get_response_key, set_cached_data)
+from .metrics import measure
+from .representation import compile_representation
+from .serializers import get_query_list
+
+
+class CollectionVersionMixin:
+    """Коллекция, версия которой определяет актуальность ответов."""
+
+    cache_namespace: str = ''
+    # Действия, ответы которых кэшируются или получают ETag по версии.
+    versioned_actions = ('list', 'retrieve')
+
+    def get_cache_namespace(self) -> str:
+        """Коллекция, изменения которой сбрасывают кэш."""
+        return self.cache_namespace
+
+
+class ConditionalGetMixin(CollectionVersionMixin):
+    """Ответ 304 без обращения к базе, если коллекция не менялась."""
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        """Проверка If-None-Match и If-Modified-Since."""
+        namespace = self.get_cache_namespace()
+        etag = get_etag(namespace, request.accepted_renderer.format,
+                        request.get_full_path())
+        last_modified = get_last_modified(namespace)
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK,
+                                    status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """Список с проверкой условий."""
+        return self.get_conditional_response(super().list, request,
+                                             *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Объект с проверкой условий."""
+        return self.get_conditional_response(super().retrieve, request,
+                                             *args, **kwargs)
+
+
+class CachedResponseMixin(CollectionVersionMixin):
+    """Кэширование ответов на чтение по версии коллекции."""
+
+    def can_cache_response(self, request) -> bool:
+        """Можно ли отдать ответ из кэша."""
+        return True
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        """Ответ из кэша или от обработчика с сохранением."""
+        if not self.can_cache_response(request):
+            return handler(request, *args, **kwargs)
+        key = get_response_key(self.get_cache_namespace(),
+                               request.build_absolute_uri())
+        data = get_cached_data(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            set_cached_data(key, response.data)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        """Список из кэша."""
+        return self.get_cached_response(super().list, request,
+                                        *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        """Объект из кэша."""
+        return self.get_cached_response(super().retrieve, request,
+                                        *args, **kwargs)
+
+
+class BulkCreateMixin:
+    """Пакетное создание объектов списком.
+
+    Каждый элемент проверяется сериализатором отдельно, корректные
+    сохраняются пакетами по BULK_BATCH_SIZE в отдельных транзакциях,
+    ошибки возвращаются с индексом элемента.
+    """
+
+    @action(detail=False, methods=('post',), url_path='bulk')
+    def bulk_create(self, request, *args, **kwargs):
+        """Создание списка объектов."""
+        if not isinstance(request.data, list):
+            raise ValidationError('Ожидается список объектов.')
+        if len(request.data) > settings.BULK_MAX_ITEMS:
+            raise ValidationError(
+                f'Не больше {settings.BULK_MAX_ITEMS} объектов за запрос.')
+        serializer = self.get_serializer(data=request.data, many=True)
+        valid_data, errors = [], []
+        for index, item in enumerate(request.data):
+            try:
+                valid_data.append(serializer.child.run_validation(item))
+            except ValidationError as error:
+                errors.append({'index': index, 'errors': error.detail})
+        if not valid_data:
+            return Response({'created': [], 'errors': errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+        created = []
+        batch_size = settings.BULK_BATCH_SIZE
+        for start in range(0, len(valid_data), batch_size):
+            with transaction.atomic():
+                created.extend(self.perform_bulk_create(
+                    valid_data[start:start + batch_size]))
+        return Response(
+            {'created': self.get_serializer(created, many=True).data,
+             'errors': errors},
+            status=status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, validated_data):
+        """Сохранение пакета, возвращает созданные объекты."""
+        raise NotImplementedError
+
+    def get_throttle_scope(self):
+        """Отдельная частота пакетов: запрос создаёт до BULK_MAX_ITEMS."""
+        scope = getattr(self, 'throttle_scope', None)
+        if scope is not None and self.action == 'bulk_create':
+            return f'{scope}_bulk'
+        return scope
+
+
+class SparseFieldsMixin:
+    """Запрос к базе под параметры fields и expand сериализатора."""
+
+    # Раскрываемое поле и связь для select_related или Prefetch.
+    expand_select_related: dict = {}
+    expand_prefetch_related: dict = {}
+
+    def get_sparse_queryset(self, queryset):
+        """Только запрошенные поля и загрузка раскрытых связей."""
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        expand = (get_query_list(self.request, 'expand')
+                  & set(serializer_class.expandable_fields))
+        # Без известных полей сериализатор выводит все поля.
+        fields = (get_query_list(self.request, 'fields')
+                  & set(serializer_class().fields))
+        if fields:
+            queryset = queryset.only(
+                *self.get_only_fields(queryset, fields | expand))
+        for name in expand:
+            if name in self.expand_select_related:
+                queryset = queryset.select_related(
+                    self.expand_select_related[name])
+            if name in self.expand_prefetch_related:
+                queryset = queryset.prefetch_related(
+                    self.expand_prefetch_related[name])
+        return queryset
+
+    def get_only_fields(self, queryset, names):
+        """Поля модели для only(): первичный ключ, ключ пагинации и поля
+        сериализатора вместе с полями связанных моделей."""
+        model = queryset.model
+        serializer_fields = self.get_serializer_class()().fields
+        only = {model._meta.pk.name}
+        only.update(name.lstrip('-')
+                    for name in getattr(self, 'keyset_ordering', ()))
+        # Связь из select_related нельзя отложить: от ненужной
+        # загружается только первичный ключ.
+        if isinstance(queryset.query.select_related, dict):
+            for name in queryset.query.select_related:
+                related = model._meta.get_field(name).related_model
+                only.update((name, f'{name}__{related._meta.pk.name}'))
+        for name in names & set(serializer_fields):
+            field = serializer_fields[name]
+            source = field.source.replace('.', '__')
+            try:
+                if not model._meta.get_field(source).concrete:
+                    continue
+            except FieldDoesNotExist:
+                continue
+            only.add(source)
+            if isinstance(field, SlugRelatedField):
+                only.add(f'{source}__{field.slug_field}')
+        return only
+
+
+class ValuesListMixin:
+    """Список через values() и собранное представление сериализатора.
+
+    Ответ совпадает с ответом сериализатора. Если у сериализатора есть
+    вложенные или вычисляемые поля, а также для результатов не из
+    QuerySet, список выводится обычным путём.
+    """
+
+    def list(self, request, *args, **kwargs):
+        """Список без создания экземпляров моделей."""
+        representation = compile_representation(self.get_serializer())
+        if representation is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        if not isinstance(queryset, QuerySet):
+            return super().list(request, *args, **kwargs)
+        # Ключ пагинации нужен в строках, даже если его нет в ответе.
+        lookups = {queryset.model._meta.pk.name, *representation.lookups}
+        lookups.update(name.lstrip('-')
+                       for name in getattr(self, 'keyset_ordering', ()))
+        rows = queryset.values(*lookups)
+        page = self.paginate_queryset(rows)
+        with measure('serializer'):
+            data = [representation(row)
+                    for row in (rows if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class ReplicaReadMixin:
+    """Чтение с реплик для безопасных запросов.
+
+    После успешной записи пользователь на DATABASE_REPLICA_PIN_SECONDS
+    читает с основной базы и видит свои изменения. Так же после смены
+    версии коллекции её ответы с ETag и кэшем читаются с основной базы,
+    пока реплики не догонят новую версию.
+    """
+
+    replica_token = None
+
+    def can_read_replica(self, request) -> bool:
+        """Можно ли собрать ответ по данным реплики."""
+        if request.method not in SAFE_METHODS:
+            return False
+        if (isinstance(self, CollectionVersionMixin)
+                and getattr(self, 'action', None) in self.versioned_actions
+                and is_collection_pinned(self.get_cache_namespace())):
+            return False
+        user_id = request.user.id
+        return user_id is None or not is_pinned(user_id)
+
+    def initial(self, request, *args, **kwargs):
+        """Включение реплик после аутентификации."""
+        super().initial(request, *args, **kwargs)
+        if self.can_read_replica(request):
+            self.replica_token = enable_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Выключение реплик и привязка пишущего к основной базе."""
+        if self.replica_token is not None:
+            disable_replica_reads(self.replica_token)
+            self.replica_token = None
+        if (request.method not in SAFE_METHODS
+                and getattr(request.user, 'id', None) is not None
+                and response.status_code < status.HTTP_400_BAD_REQUEST):
+            pin_to_primary(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class AsyncReadMixin:
+    """Асинхронное представление при ASYNC_READ_VIEWS, например под ASGI."""
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        """Представление для маршрута."""
+        view = super().as_view(*args, **kwargs)
+        if settings.ASYNC_READ_VIEWS:
+            return async_read_view(view)
+        return view
@@ -0,0 +1,18 @@
+"""Модели API."""
+
+from django.db import models  # type: ignore
+
+
+class RevokedToken(models.Model):
+    """Отозванный JWT."""
+
+    jti = models.CharField(max_length=255, unique=True,
+                           verbose_name='Идентификатор токена')
+    expires_at = models.DateTimeField(db_index=True,
+                                      verbose_name='Истекает')
+
+    class Meta:
+        verbose_name = 'Отозванные токены'
+
+    def __str__(self):
+        return self.jti
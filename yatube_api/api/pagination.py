@@ -0,0 +1,156 @@
+"""Пагинация."""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from django.core.exceptions import ValidationError  # type: ignore
+from django.db.models import Q, QuerySet  # type: ignore
+from rest_framework.exceptions import NotFound  # type: ignore
+from rest_framework.pagination import (  # type: ignore
+    BasePagination, LimitOffsetPagination, _positive_int)
+from rest_framework.response import Response  # type: ignore
+from rest_framework.utils.urls import replace_query_param  # type: ignore
+
+
+class KeysetPagination(BasePagination):
+    """Пагинация по ключу без OFFSET и COUNT.
+
+    Ключ берётся из атрибута представления `keyset_ordering`: поле даты
+    и уникальное поле, например ('pub_date', 'id'). Направление задаётся
+    знаком минус у полей, как в order_by. Вместо QuerySet можно передать
+    уже упорядоченный объект с методом after(position), например ленту.
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = 10
+    max_limit = 100
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Страница записей после позиции из курсора."""
+        self.request = request
+        self.ordering = tuple(view.keyset_ordering)
+        self.fields = tuple(name.lstrip('-') for name in self.ordering)
+        self.limit = self.get_limit(request)
+        position = self.decode_cursor(request, queryset.model)
+        if not isinstance(queryset, QuerySet):
+            if position is not None:
+                queryset = queryset.after(position)
+        else:
+            queryset = queryset.order_by(*self.ordering)
+            if position is not None:
+                queryset = queryset.filter(
+                    self.get_position_filter(position))
+        page = list(queryset[:self.limit + 1])
+        self.has_next = len(page) > self.limit
+        page = page[:self.limit]
+        self.next_position = (self.get_position(page[-1])
+                              if self.has_next else None)
+        return page
+
+    def get_paginated_response(self, data):
+        """Ответ со ссылкой на следующую страницу."""
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_limit(self, request):
+        """Размер страницы."""
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_position(self, item):
+        """Значения ключа у записи или строки values()."""
+        if isinstance(item, dict):
+            return tuple(item[name] for name in self.fields)
+        return tuple(getattr(item, name) for name in self.fields)
+
+    def get_position_filter(self, position):
+        """Условие «строго после позиции» для составного ключа."""
+        (first, second), (first_value, second_value) = self.fields, position
+        lookup = 'lt' if self.ordering[0].startswith('-') else 'gt'
+        return (Q(**{f'{first}__{lookup}': first_value})
+                | Q(**{first: first_value,
+                       f'{second}__{lookup}': second_value}))
+
+    def get_next_link(self):
+        """Ссылка на следующую страницу."""
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param,
+            self.encode_cursor(self.next_position))
+
+    def encode_cursor(self, position):
+        """Кодирование позиции в непрозрачную строку."""
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value
+                  for value in position]
+        return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        """Позиция из курсора или None для первой страницы."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(urlsafe_b64decode(encoded.encode()))
+            if len(values) != len(self.fields):
+                raise ValueError
+            return tuple(
+                model._meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            )
+        except (Base64Error, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """Пагинация limit/offset или по ключу при наличии параметра cursor.
+
+    Пустой параметр cursor запрашивает первую страницу по ключу.
+    """
+
+    keyset_class = KeysetPagination
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбор режима пагинации по параметрам запроса."""
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """Ответ в формате выбранного режима."""
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class IncludedCommentsPagination(LimitOffsetPagination):
+    """Страница комментариев в ответе с постом.
+
+    Общее число берётся из счётчика комментариев поста вместо COUNT.
+    """
+
+    limit_query_param = 'comments_limit'
+    offset_query_param = 'comments_offset'
+    default_limit = 10
+    max_limit = 100
+
+    def __init__(self, post):
+        self.post = post
+
+    def get_count(self, queryset):
+        """Число комментариев поста."""
+        return self.post.comment_count
@@ -11,7 +11,7 @@ class IsAuthenticatedAuthorOrReadOnly(IsAuthenticatedOrReadOnly):
 
     def has_object_permission(self, request, view, post_or_comment):
         """Проверка авторства."""
-        return (post_or_comment.author == request.user
+        return (post_or_comment.author_id == request.user.id
                 if request.method not in SAFE_METHODS
                 else True)
 
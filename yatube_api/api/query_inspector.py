@@ -0,0 +1,130 @@
+"""Поиск N+1 и медленных запросов к базе.
+
+Запросы с одинаковой формой, отличающиеся только значениями, в одном
+запросе к API обычно означают N+1: связь читается отдельно для
+каждого объекта. Форма — текст SQL без значений и с одним IN (...)
+на список любой длины. Учёт ведётся обёрткой execute_wrapper
+внутри inspect_queries(), вне блока обёртка ничего не делает.
+"""
+
+import logging
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings  # type: ignore
+from django.db.backends.signals import connection_created  # type: ignore
+from django.dispatch import receiver  # type: ignore
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+SPACES_RE = re.compile(r'\s+')
+
+# Кадров стека в сообщении, без обёрток соединения.
+STACK_LIMIT = 5
+WRAPPER_FILES = (__file__, metrics.__file__)
+
+_inspector = ContextVar('query_inspector', default=None)
+
+
+def fingerprint(sql: str) -> str:
+    """Форма запроса без значений."""
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql.replace('%s', '?'))
+    sql = SPACES_RE.sub(' ', sql).strip()
+    return IN_LIST_RE.sub('IN (...)', sql)
+
+
+def stack_excerpt() -> str:
+    """Последние кадры кода репозитория, из которого пришёл запрос."""
+    root = str(settings.BASE_DIR.parent)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-1]
+        if frame.filename.startswith(root)
+        and 'site-packages' not in frame.filename
+        and frame.filename not in WRAPPER_FILES
+    ]
+    return ''.join(traceback.format_list(frames[-STACK_LIMIT:]))
+
+
+class QueryInspector:
+    """Запросы к базе в пределах inspect_queries()."""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.stacks: dict = {}
+        self.total = 0
+
+    def record(self, sql: str, duration: float) -> None:
+        """Учёт выполненного запроса."""
+        shape = fingerprint(sql)
+        self.total += 1
+        self.counts[shape] += 1
+        if shape not in self.stacks:
+            self.stacks[shape] = stack_excerpt()
+        if duration >= settings.SLOW_QUERY_SECONDS:
+            logger.warning('Медленный запрос, %.3f с: %s\n%s',
+                           duration, sql, stack_excerpt())
+
+    def repeated(self, limit: int) -> list:
+        """Формы, повторённые больше limit раз, с местом первого вызова."""
+        return [(shape, count, self.stacks[shape])
+                for shape, count in self.counts.most_common()
+                if count > limit]
+
+
+def inspect_query(execute, sql, params, many, context):
+    """Обёртка соединения: учёт запроса в текущем QueryInspector."""
+    inspector = _inspector.get()
+    if inspector is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        inspector.record(sql, time.perf_counter() - started)
+
+
+@receiver(connection_created)
+def install_inspector(sender, connection, **kwargs):
+    """Обёртка на каждое новое соединение."""
+    if inspect_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(inspect_query)
+
+
+@contextmanager
+def inspect_queries():
+    """Учёт запросов к базе внутри блока."""
+    inspector = QueryInspector()
+    token = _inspector.set(inspector)
+    try:
+        yield inspector
+    finally:
+        _inspector.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries=None, max_repeats=1):
+    """Ошибка AssertionError, если блок превысил бюджет запросов.
+
+    max_queries ограничивает общее число запросов, max_repeats — число
+    запросов одной формы.
+    """
+    with inspect_queries() as inspector:
+        yield inspector
+    problems = []
+    if max_queries is not None and inspector.total > max_queries:
+        problems.append(
+            f'Запросов к базе {inspector.total}, допустимо {max_queries}.')
+    for shape, count, stack in inspector.repeated(max_repeats):
+        problems.append(f'Запрос повторён {count} раз: {shape}\n{stack}')
+    if problems:
+        raise AssertionError('\n'.join(problems))
@@ -0,0 +1,38 @@
+"""Рендереры ответов."""
+
+from django.conf import settings  # type: ignore
+from rest_framework.renderers import JSONRenderer  # type: ignore
+from rest_framework.utils.encoders import JSONEncoder  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# Дата в UTC с суффиксом Z, как у полей дат DRF.
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+                  if orjson is not None else 0)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON через orjson, если он установлен, иначе через json.
+
+    Библиотека выбирается настройкой JSON_RENDERER_BACKEND. Даты
+    orjson выводит сам, остальные типы (Decimal, ленивые строки)
+    передаются кодировщику DRF. Ответ с отступами, например для
+    браузерного API, строится стандартным рендерером.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Тело ответа в байтах."""
+        if (orjson is None or settings.JSON_RENDERER_BACKEND != 'orjson'
+                or self.get_indent(accepted_media_type or '',
+                                   renderer_context or {})):
+            return super().render(data, accepted_media_type,
+                                  renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self.encoder.default,
+                            option=ORJSON_OPTIONS)
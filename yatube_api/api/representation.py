@@ -0,0 +1,121 @@
+"""Представление записей списка без экземпляров моделей."""
+
+from django.core.exceptions import FieldDoesNotExist  # type: ignore
+from rest_framework import serializers  # type: ignore
+from rest_framework.relations import (  # type: ignore
+    PrimaryKeyRelatedField, SlugRelatedField)
+
+# Поля, у которых представление совпадает со значением из values().
+PLAIN_FIELDS = (serializers.IntegerField, serializers.CharField,
+                serializers.BooleanField)
+# Поля, которые выводятся только сериализатором.
+NESTED_FIELDS = (serializers.BaseSerializer, serializers.ManyRelatedField,
+                 serializers.SerializerMethodField)
+
+
+class CompiledRepresentation:
+    """Представление сериализатора, собранное для строк values().
+
+    Для каждого поля заранее выбраны путь в базе и преобразование,
+    поэтому строка превращается в словарь без экземпляра модели и
+    без обхода полей сериализатора. Ключи идут в порядке полей
+    сериализатора, значения совпадают с его to_representation.
+    """
+
+    def __init__(self, lookups, converters):
+        self.lookups = lookups
+        self.converters = converters
+
+    def __call__(self, row):
+        """Словарь ответа для строки values()."""
+        data = {}
+        for name, lookup, convert in self.converters:
+            value = row[lookup]
+            data[name] = (value if value is None or convert is None
+                          else convert(value))
+        return data
+
+
+def get_file_converter(field, model_field):
+    """Ссылка на файл по имени, как у FileField сериализатора."""
+    request = field.context.get('request')
+
+    def convert(name):
+        if not name:
+            return None
+        url = model_field.storage.url(name)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    return convert
+
+
+def get_file_plan(field, model_field):
+    """Путь в базе для файла: имя или ссылка."""
+    if not getattr(field, 'use_url', True):
+        return field.source, None
+    return field.source, get_file_converter(field, model_field)
+
+
+def get_related_plan(field):
+    """Путь в базе для связи: слаг или первичный ключ."""
+    if isinstance(field, SlugRelatedField):
+        return f'{field.source}__{field.slug_field}', None
+    if type(field) is PrimaryKeyRelatedField and field.pk_field is None:
+        return field.source, None
+    return None
+
+
+def get_source_field(model, source):
+    """Поле модели по source, в том числе через связи «к одному»."""
+    *relations, name = source.split('.')
+    for relation in relations:
+        related = model._meta.get_field(relation)
+        if not (related.many_to_one or related.one_to_one):
+            raise FieldDoesNotExist(relation)
+        model = related.related_model
+    return model._meta.get_field(name)
+
+
+def get_field_plan(field, model):
+    """Путь в базе и преобразование для поля или None, если поле
+    можно вывести только через сериализатор."""
+    if field.source == '*' or isinstance(field, NESTED_FIELDS):
+        return None
+    try:
+        model_field = get_source_field(model, field.source)
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete:
+        return None
+    if '.' in field.source:
+        # Поле связанной модели: только значения без преобразования.
+        if type(field) not in PLAIN_FIELDS:
+            return None
+        return field.source.replace('.', '__'), None
+    if isinstance(field, serializers.RelatedField):
+        return get_related_plan(field)
+    if isinstance(field, serializers.FileField):
+        return get_file_plan(field, model_field)
+    if type(field) in PLAIN_FIELDS:
+        return field.source, None
+    return field.source, field.to_representation
+
+
+def compile_representation(serializer):
+    """Представление для сериализатора модели или None, если есть
+    вложенные, вычисляемые или неизвестные поля."""
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return None
+    lookups, converters = [], []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        plan = get_field_plan(field, model)
+        if plan is None:
+            return None
+        lookup, convert = plan
+        lookups.append(lookup)
+        converters.append((name, lookup, convert))
+    return CompiledRepresentation(lookups, converters)
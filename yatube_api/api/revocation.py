@@ -0,0 +1,97 @@
+"""Отзыв JWT.
+
+Идентификаторы (jti) отозванных токенов хранятся в базе. Проверка токена
+идёт по фильтру Блума в памяти процесса, который перечитывается раз в
+JWT_REVOCATION_REFRESH секунд; к базе обращаются только при попадании в
+фильтр. Отзыв, сделанный в другом процессе, начинает действовать после
+обновления фильтра этого процесса.
+"""
+
+from datetime import datetime, timezone
+from hashlib import blake2b
+from math import ceil, log
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings  # type: ignore
+from django.utils import timezone as django_timezone  # type: ignore
+
+from .models import RevokedToken
+
+
+class BloomFilter:
+    """Фильтр Блума: без ложноотрицательных ответов."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, ceil(-capacity * log(error_rate) / log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, item: str):
+        """Номера битов элемента (двойное хеширование)."""
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:], 'big') | 1
+        return ((first + number * second) % self.size
+                for number in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        """Добавление элемента."""
+        for position in self.positions(item):
+            self.bits[position // 8] |= 1 << position % 8
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position // 8] & 1 << position % 8
+                   for position in self.positions(item))
+
+
+class RevocationList:
+    """Список отозванных токенов процесса."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.filter = None
+        self.loaded_at = 0.0
+
+    def is_stale(self) -> bool:
+        """Пора ли перечитать фильтр."""
+        return (self.filter is None
+                or monotonic() - self.loaded_at
+                > settings.JWT_REVOCATION_REFRESH)
+
+    def refresh(self) -> None:
+        """Фильтр из действующих отозванных токенов."""
+        with self.lock:
+            if not self.is_stale():
+                return
+            jtis = list(RevokedToken.objects.filter(
+                expires_at__gt=django_timezone.now()
+            ).values_list('jti', flat=True))
+            bloom = BloomFilter(
+                max(2 * len(jtis), settings.JWT_REVOCATION_CAPACITY),
+                settings.JWT_REVOCATION_ERROR_RATE)
+            for jti in jtis:
+                bloom.add(jti)
+            self.filter, self.loaded_at = bloom, monotonic()
+
+    def is_revoked(self, jti: str) -> bool:
+        """Отозван ли токен: база проверяется только при попадании."""
+        if self.is_stale():
+            self.refresh()
+        if jti not in self.filter:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti: str, expires_at: int) -> None:
+        """Отзыв токена до окончания его срока действия."""
+        now = django_timezone.now()
+        RevokedToken.objects.filter(expires_at__lte=now).delete()
+        RevokedToken.objects.get_or_create(jti=jti, defaults={
+            'expires_at': datetime.fromtimestamp(expires_at, timezone.utc)})
+        if self.is_stale():
+            self.refresh()
+        with self.lock:
+            self.filter.add(jti)
+
+
+revocation_list = RevocationList()
@@ -1,26 +1,83 @@
 """Сериализаторы."""
 
 from rest_framework import serializers  # type: ignore
+from rest_framework.permissions import SAFE_METHODS  # type: ignore
 from rest_framework.relations import SlugRelatedField  # type: ignore
 from django.contrib.auth import get_user_model  # type: ignore
 from rest_framework.validators import UniqueTogetherValidator  # type: ignore
+from rest_framework_simplejwt.exceptions import (  # type: ignore
+    InvalidToken, TokenError)
+from rest_framework_simplejwt.serializers import (  # type: ignore
+    TokenRefreshSerializer, TokenVerifySerializer)
+from rest_framework_simplejwt.settings import api_settings  # type: ignore
+from rest_framework_simplejwt.tokens import UntypedToken  # type: ignore
 
 from posts.models import Comment, Post, Group, Follow
+from .metrics import measure
+from .revocation import revocation_list
 
 User = get_user_model()
 
 
-class PostSerializer(serializers.ModelSerializer):
+def get_query_list(request, name: str) -> set:
+    """Значения параметра запроса, перечисленные через запятую."""
+    if request is None:
+        return set()
+    return {value.strip()
+            for value in request.query_params.get(name, '').split(',')
+            if value.strip()}
+
+
+class TimedRepresentationMixin:
+    """Время вывода в показателе serializer метрик запроса."""
+
+    def to_representation(self, instance):
+        with measure('serializer'):
+            return super().to_representation(instance)
+
+
+class DynamicFieldsMixin:
+    """Поля из параметра fields и раскрытые связи из параметра expand.
+
+    Параметры действуют только на чтение и только для сериализатора
+    верхнего уровня: вложенные создаются без контекста.
+    """
+
+    # Имя поля и фабрика вложенного сериализатора.
+    expandable_fields: dict = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return
+        requested = get_query_list(request, 'fields') & set(self.fields)
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+        expand = get_query_list(request, 'expand')
+        for name in expand & set(self.expandable_fields):
+            self.fields[name] = self.expandable_fields[name]()
+
+
+class PostSerializer(TimedRepresentationMixin, DynamicFieldsMixin,
+                     serializers.ModelSerializer):
     """Сериализатор постов."""
 
     author = SlugRelatedField(slug_field='username', read_only=True)
+    expandable_fields = {
+        'group': lambda: GroupSerializer(read_only=True),
+        'comments': lambda: CommentSerializer(many=True, read_only=True),
+    }
 
     class Meta:
         fields = '__all__'
         model = Post
+        read_only_fields = ('comment_count', 'image_variants')
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedRepresentationMixin, DynamicFieldsMixin,
+                        serializers.ModelSerializer):
     """Сериализатор комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -33,7 +90,8 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ('post',)
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(TimedRepresentationMixin,
+                      serializers.ModelSerializer):
     """Сериализатор групп."""
 
     class Meta:
@@ -41,7 +99,8 @@ class GroupSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class FollowSerializer(serializers.ModelSerializer):
+class FollowSerializer(TimedRepresentationMixin,
+                       serializers.ModelSerializer):
     """Сериализатор подписок."""
 
     user = serializers.SlugRelatedField(
@@ -49,10 +108,13 @@ class FollowSerializer(serializers.ModelSerializer):
         default=serializers.CurrentUserDefault())
     following = serializers.SlugRelatedField(
         slug_field='username', queryset=User.objects.all())
+    # Профиль создаётся при первой подписке на пользователя.
+    follower_count = serializers.IntegerField(
+        source='following.profile.follower_count', read_only=True)
 
     class Meta:
         model = Follow
-        fields = ('user', 'following')
+        fields = ('user', 'following', 'follower_count')
         # Нельзя дублировать подписки.
         validators = (
             UniqueTogetherValidator(
@@ -73,3 +135,53 @@ class FollowSerializer(serializers.ModelSerializer):
         if request.user == following:
             raise serializers.ValidationError('Нельзя подписаться на себя.')
         return following
+
+
+def check_not_revoked(raw_token):
+    """Токен действителен и не отозван."""
+    try:
+        token = UntypedToken(raw_token)
+    except TokenError as error:
+        raise InvalidToken(error.args[0])
+    if revocation_list.is_revoked(token.get(api_settings.JTI_CLAIM, '')):
+        raise InvalidToken('Токен отозван.')
+    return token
+
+
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Обновление токена с проверкой отзыва."""
+
+    def validate(self, attrs):
+        """Отозванный refresh-токен не обновляется."""
+        check_not_revoked(attrs['refresh'])
+        return super().validate(attrs)
+
+
+class RevocableTokenVerifySerializer(TokenVerifySerializer):
+    """Проверка токена с учётом отзыва."""
+
+    def validate(self, attrs):
+        """Отозванный токен недействителен."""
+        check_not_revoked(attrs['token'])
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    """Отзыв токена."""
+
+    token = serializers.CharField()
+
+    def validate_token(self, raw_token):
+        """Отозвать можно только действительный токен."""
+        try:
+            token = check_not_revoked(raw_token)
+        except InvalidToken as error:
+            raise serializers.ValidationError(error.detail)
+        if api_settings.JTI_CLAIM not in token:
+            raise serializers.ValidationError('Токен без идентификатора.')
+        return token
+
+    def save(self):
+        """Запись в список отозванных."""
+        token = self.validated_data['token']
+        revocation_list.revoke(token[api_settings.JTI_CLAIM], token['exp'])
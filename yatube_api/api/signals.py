@@ -0,0 +1,43 @@
+"""Сброс кэша API при изменении моделей.
+
+Версия меняется после фиксации транзакции: иначе параллельный запрос
+успел бы прочитать старые строки и сохранить их под новой версией.
+"""
+
+from django.contrib.auth import get_user_model  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models.signals import post_delete, post_save  # type: ignore
+from django.dispatch import receiver  # type: ignore
+
+from posts.models import Comment, Group, Post
+from .authentication import invalidate_user
+from .cache import bump_version
+
+User = get_user_model()
+
+
+@receiver((post_save, post_delete), sender=Group)
+def invalidate_groups(sender, **kwargs):
+    """Изменение группы меняет и посты, раскрытые с expand=group."""
+    transaction.on_commit(lambda: (
+        bump_version('groups'), bump_version('posts')))
+
+
+@receiver((post_save, post_delete), sender=Post)
+def invalidate_posts(sender, **kwargs):
+    """Изменение поста."""
+    transaction.on_commit(lambda: bump_version('posts'))
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_comments(sender, instance, **kwargs):
+    """Изменение комментария меняет и пост, и комментарии поста."""
+    post_id = instance.post_id
+    transaction.on_commit(lambda: (
+        bump_version('posts'), bump_version(f'comments:{post_id}')))
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_auth_user(sender, instance, **kwargs):
+    """Изменение пользователя, например блокировка."""
+    invalidate_user(instance.pk)
@@ -0,0 +1,187 @@
+"""Ограничение частоты записи по алгоритму token bucket.
+
+Ведро вмещает столько токенов, сколько запросов разрешено за период,
+и пополняется равномерно. Запрос на запись забирает токен, пустое
+ведро даёт ответ 429 со временем до следующего токена. Проверка
+читает и пишет одну запись хранилища.
+
+Частоты задаются в REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] по
+ключам '<throttle_scope>_user' и '<throttle_scope>_ip', где
+throttle_scope — атрибут представления или результат его метода
+get_throttle_scope(). Пакетное создание идёт по своим частотам
+'<throttle_scope>_bulk_user' и '<throttle_scope>_bulk_ip'.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.utils.module_loading import import_string  # type: ignore
+from rest_framework.permissions import SAFE_METHODS  # type: ignore
+from rest_framework.settings import api_settings  # type: ignore
+from rest_framework.throttling import BaseThrottle  # type: ignore
+
+try:
+    import fcntl
+except ImportError:
+    # Блокировка файлов доступна только в POSIX.
+    fcntl = None
+
+BUCKET_KEY = 'api:throttle:{scope}:{ident}'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_store = None
+
+
+def parse_rate(rate: str):
+    """Число запросов и период в секундах из строки вида '30/min'."""
+    number, period = rate.split('/')
+    return int(number), PERIODS[period[0]]
+
+
+def take_token(state, capacity: int, refill: float, now: float):
+    """Новое состояние ведра и ожидание в секундах, 0 — токен выдан."""
+    tokens, updated = state if state else (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * refill)
+    if tokens >= 1:
+        return (tokens - 1, now), 0.0
+    return (tokens, now), (1 - tokens) / refill
+
+
+class MemoryBucketStore:
+    """Вёдра в памяти процесса, самые старые вытесняются."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self.buckets: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+
+    def update(self, key: str, func, timeout: float):
+        """Атомарное изменение ведра функцией, возвращает её результат."""
+        with self.lock:
+            state, result = func(self.buckets.pop(key, None))
+            self.buckets[key] = state
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        return result
+
+
+class CacheBucketStore:
+    """Вёдра в кэше Django, общем для процессов, например в Redis.
+
+    Ведро меняется под блокировкой: cache.add атомарен в Redis,
+    Memcached и кэше в базе. Блокировка упавшего процесса снимается
+    сама через lock_timeout секунд.
+    """
+
+    lock_timeout = 1
+    retry_delay = 0.001
+
+    def update(self, key: str, func, timeout: float):
+        """Изменение ведра под блокировкой, возвращает результат функции."""
+        lock_key = f'{key}:lock'
+        while not cache.add(lock_key, True, self.lock_timeout):
+            time.sleep(self.retry_delay)
+        try:
+            state, result = func(cache.get(key))
+            cache.set(key, state, timeout)
+        finally:
+            cache.delete(lock_key)
+        return result
+
+
+class FileLockBucketStore:
+    """Вёдра в файлах с блокировкой, общие для процессов одной машины."""
+
+    def __init__(self, path=None):
+        if fcntl is None:
+            raise RuntimeError('Хранилище требует fcntl (POSIX).')
+        self.path = Path(path or settings.THROTTLE_FILE_PATH)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def update(self, key: str, func, timeout: float):
+        """Изменение ведра под блокировкой файла."""
+        name = hashlib.sha1(key.encode()).hexdigest()
+        with open(self.path / name, 'a+') as bucket:
+            fcntl.flock(bucket, fcntl.LOCK_EX)
+            bucket.seek(0)
+            content = bucket.read()
+            state, result = func(json.loads(content) if content else None)
+            bucket.seek(0)
+            bucket.truncate()
+            bucket.write(json.dumps(state))
+        return result
+
+
+def get_store():
+    """Хранилище вёдер из настройки THROTTLE_STORE."""
+    global _store
+    if _store is None:
+        _store = import_string(settings.THROTTLE_STORE)()
+    return _store
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Ограничение запросов на запись по ведру токенов."""
+
+    scope_suffix = ''
+    wait_time = None
+
+    def get_bucket_ident(self, request):
+        """Владелец ведра или None, если ограничение не применяется."""
+        raise NotImplementedError
+
+    def get_scope(self, view):
+        """Область ограничения представления или None."""
+        get_throttle_scope = getattr(view, 'get_throttle_scope', None)
+        if get_throttle_scope is not None:
+            return get_throttle_scope()
+        return getattr(view, 'throttle_scope', None)
+
+    def allow_request(self, request, view):
+        """Токен из ведра владельца для запроса на запись."""
+        if request.method in SAFE_METHODS:
+            return True
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(
+            f'{scope}_{self.scope_suffix}')
+        ident = self.get_bucket_ident(request)
+        if scope is None or rate is None or ident is None:
+            return True
+        capacity, period = parse_rate(rate)
+        refill = capacity / period
+        self.wait_time = get_store().update(
+            BUCKET_KEY.format(scope=f'{scope}_{self.scope_suffix}',
+                              ident=ident),
+            lambda state: take_token(state, capacity, refill, time.time()),
+            period)
+        return self.wait_time == 0
+
+    def wait(self):
+        """Секунды до следующего токена."""
+        return self.wait_time
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Ведро на пользователя."""
+
+    scope_suffix = 'user'
+
+    def get_bucket_ident(self, request):
+        """Идентификатор пользователя."""
+        return request.user.id
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Ведро на адрес клиента, с учётом NUM_PROXIES."""
+
+    scope_suffix = 'ip'
+
+    def get_bucket_ident(self, request):
+        """Адрес клиента."""
+        return self.get_ident(request)
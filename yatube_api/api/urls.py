@@ -2,7 +2,9 @@
 
 from django.urls import include, path  # type: ignore
 from rest_framework import routers  # type: ignore
-from .views import PostViewSet, GroupViewSet, CommentViewSet, FollowView
+from .views import (PostViewSet, GroupViewSet, CommentViewSet, ExportView,
+                    FeedView, FollowView, TokenRefreshRevocableView,
+                    TokenRevokeView, TokenVerifyRevocableView)
 
 app_name: str = 'api'
 
@@ -13,8 +15,16 @@ router.register(r'posts/(?P<post_id>\d+)/comments', CommentViewSet,
                 basename='comments')
 
 v1_patterns: list[path] = [
+    # Обновление и проверка токенов djoser с учётом отзыва.
+    path('jwt/refresh/', TokenRefreshRevocableView.as_view(),
+         name='jwt-refresh'),
+    path('jwt/verify/', TokenVerifyRevocableView.as_view(),
+         name='jwt-verify'),
+    path('jwt/revoke/', TokenRevokeView.as_view(), name='jwt-revoke'),
     path('', include('djoser.urls.jwt')),
     path('follow/', FollowView.as_view(), name='follows'),
+    path('feed/', FeedView.as_view(), name='feed'),
+    path('export/posts/', ExportView.as_view(), name='export-posts'),
     path('', include(router.urls)),
 ]
 
@@ -1,15 +1,42 @@
 """Контроллеры."""
 
-from rest_framework import viewsets, generics, filters  # type: ignore
-from rest_framework.pagination import LimitOffsetPagination  # type: ignore
+from rest_framework import (  # type: ignore
+    viewsets, generics, filters, status)
+from rest_framework.exceptions import ValidationError  # type: ignore
+from rest_framework.pagination import _positive_int  # type: ignore
+from rest_framework.views import APIView  # type: ignore
+from django.conf import settings  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models import Prefetch  # type: ignore
 from django.shortcuts import get_object_or_404  # type: ignore
-from rest_framework.permissions import IsAuthenticated  # type: ignore
+from rest_framework.permissions import (  # type: ignore
+    AllowAny, IsAuthenticated)
+from rest_framework.response import Response  # type: ignore
+from rest_framework_simplejwt.views import (  # type: ignore
+    TokenRefreshView, TokenVerifyView)
 from django.contrib.auth import get_user_model  # type: ignore
-from django.http import JsonResponse  # type: ignore
+from django.http import (  # type: ignore
+    Http404, HttpResponse, JsonResponse, StreamingHttpResponse)
 
-from posts.models import Post, Group
+from posts.bulk import bulk_create_with_pk
+from posts.counters import change_comment_count
+from posts.feed import fan_out_posts, get_feed
+from posts.images import schedule_image_processing
+from posts.models import Comment, Post, Group
+from posts.search import SearchResults
+from .cache import bump_version
+from .export import iter_ndjson
+from .metrics import registry
+from .mixins import (AsyncReadMixin, BulkCreateMixin, CachedResponseMixin,
+                     ConditionalGetMixin, ReplicaReadMixin, SparseFieldsMixin,
+                     ValuesListMixin)
+from .pagination import (IncludedCommentsPagination,
+                         LimitOffsetOrKeysetPagination)
 from .serializers import (CommentSerializer, FollowSerializer,
-                          PostSerializer, GroupSerializer)
+                          PostSerializer, GroupSerializer,
+                          RevocableTokenRefreshSerializer,
+                          RevocableTokenVerifySerializer,
+                          TokenRevokeSerializer, get_query_list)
 from .permissions import (IsAuthenticatedAuthorOrReadOnly,
                           ReadOnlyMethodsPermission)
 
@@ -28,22 +55,113 @@ class PermissionsReadOnlyMixin(viewsets.ModelViewSet):
     permission_classes = (ReadOnlyMethodsPermission,)
 
 
-class PostViewSet(PermissionsMixin, viewsets.ModelViewSet):
+class PostExpandMixin(SparseFieldsMixin):
+    """Раскрытие группы и комментариев постов."""
+
+    expand_select_related = {'group': 'group'}
+    expand_prefetch_related = {
+        'comments': Prefetch(
+            'comments', queryset=Comment.objects.select_related('author')),
+    }
+
+
+class IncludeCommentsMixin:
+    """Пост со страницей комментариев по параметру include=comments.
+
+    Страница задаётся параметрами comments_limit и comments_offset и
+    загружается вместе с авторами одним запросом, поэтому ответ стоит
+    двух запросов к базе при любом числе комментариев.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        """Пост и, если запрошено, страница его комментариев."""
+        if 'comments' not in get_query_list(request, 'include'):
+            return super().retrieve(request, *args, **kwargs)
+        post = self.get_object()
+        data = self.get_serializer(post).data
+        data['comments'] = self.get_comments_page(post)
+        return Response(data)
+
+    def get_comments_page(self, post):
+        """Страница комментариев со ссылками на соседние страницы."""
+        paginator = IncludedCommentsPagination(post)
+        comments = paginator.paginate_queryset(
+            post.comments.select_related('author').order_by('created', 'id'),
+            self.request, view=self)
+        # Вложенный сериализатор без контекста не читает fields и expand.
+        return paginator.get_paginated_response(
+            CommentSerializer(comments, many=True).data).data
+
+
+class PostViewSet(AsyncReadMixin, ReplicaReadMixin, ConditionalGetMixin,
+                  CachedResponseMixin, IncludeCommentsMixin, ValuesListMixin,
+                  BulkCreateMixin, PostExpandMixin, PermissionsMixin,
+                  viewsets.ModelViewSet):
     """Обработка постов."""
 
     serializer_class = PostSerializer
-    queryset = Post.objects.all()
-    pagination_class = LimitOffsetPagination
+    queryset = Post.objects.select_related('author')
+    pagination_class = LimitOffsetOrKeysetPagination
+    keyset_ordering = ('pub_date', 'id')
+    cache_namespace = 'posts'
+    throttle_scope = 'posts'
+
+    def can_cache_response(self, request):
+        """Кэшируются только списки для анонимных пользователей."""
+        return self.action == 'list' and not request.user.is_authenticated
+
+    def get_queryset(self):
+        """Посты или результаты поиска по параметру search."""
+        queryset = self.get_sparse_queryset(super().get_queryset())
+        query = self.request.query_params.get('search', '').strip()
+        if self.action != 'list' or not query:
+            return queryset
+        if 'cursor' in self.request.query_params:
+            raise ValidationError(
+                {'cursor': 'Результаты поиска делятся на страницы '
+                           'параметрами limit и offset.'})
+        return SearchResults(query, queryset)
 
     def perform_create(self, serializer):
         """Создание поста."""
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        schedule_image_processing(post)
 
+    def perform_update(self, serializer):
+        """Изменение поста, новое изображение обрабатывается заново."""
+        if 'image' not in serializer.validated_data:
+            serializer.save()
+            return
+        post = serializer.save(image_variants={})
+        schedule_image_processing(post)
 
-class CommentViewSet(PermissionsMixin, viewsets.ModelViewSet):
+    def perform_bulk_create(self, validated_data):
+        """Пакет постов с раскладкой по лентам.
+
+        bulk_create не отправляет сигналы, поэтому лента и кэш
+        обновляются здесь.
+        """
+        posts = bulk_create_with_pk(Post, [
+            Post(author=self.request.user, **data) for data in validated_data
+        ])
+        fan_out_posts(posts)
+        transaction.on_commit(lambda: bump_version('posts'))
+        return posts
+
+
+class CommentViewSet(AsyncReadMixin, ReplicaReadMixin, ConditionalGetMixin,
+                     ValuesListMixin, BulkCreateMixin, SparseFieldsMixin,
+                     PermissionsMixin, viewsets.ModelViewSet):
     """Обработка комментариев."""
 
     serializer_class = CommentSerializer
+    pagination_class = LimitOffsetOrKeysetPagination
+    keyset_ordering = ('created', 'id')
+    throttle_scope = 'comments'
+
+    def get_cache_namespace(self):
+        """Комментарии поста."""
+        return f'comments:{self.kwargs.get("post_id")}'
 
     def get_post(self):
         """Получение поста."""
@@ -52,39 +170,136 @@ class CommentViewSet(PermissionsMixin, viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         """Создание комментария."""
-        serializer.save(author=self.request.user,
-                        post=self.get_post())
+        # Счётчик поста обновляется сигналом в той же транзакции.
+        with transaction.atomic():
+            serializer.save(author=self.request.user,
+                            post=self.get_post())
+
+    def perform_bulk_create(self, validated_data):
+        """Пакет комментариев со счётчиком поста.
+
+        bulk_create не отправляет сигналы, поэтому счётчик и кэш
+        обновляются здесь.
+        """
+        post = self.get_post()
+        comments = bulk_create_with_pk(Comment, [
+            Comment(author=self.request.user, post=post, **data)
+            for data in validated_data
+        ])
+        change_comment_count(post.id, len(comments))
+        transaction.on_commit(lambda: (
+            bump_version('posts'), bump_version(f'comments:{post.id}')))
+        return comments
+
+    def perform_destroy(self, comment):
+        """Удаление комментария."""
+        with transaction.atomic():
+            comment.delete()
 
     def get_queryset(self):
         """Выбор комментариев."""
-        return self.get_post().comments.all()
+        return self.get_sparse_queryset(
+            self.get_post().comments.select_related('author'))
 
 
-class GroupViewSet(PermissionsReadOnlyMixin, viewsets.ReadOnlyModelViewSet):
+class GroupViewSet(AsyncReadMixin, ReplicaReadMixin, ConditionalGetMixin,
+                   CachedResponseMixin, ValuesListMixin,
+                   PermissionsReadOnlyMixin, viewsets.ReadOnlyModelViewSet):
     """Обработка групп."""
 
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
+    cache_namespace = 'groups'
 
 
-class FollowView(generics.ListCreateAPIView):
+class FollowView(AsyncReadMixin, ReplicaReadMixin, ValuesListMixin,
+                 generics.ListCreateAPIView):
     """Обработка подписок."""
 
     serializer_class = FollowSerializer
     permission_classes = (IsAuthenticated,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('following__username',)
+    throttle_scope = 'follow'
 
     def get_queryset(self):
         """Список подписок пользователя."""
-        return self.request.user.follows.all()
+        return self.request.user.follows.select_related(
+            'user', 'following__profile')
 
     def perform_create(self, serializer):
         """Создание подписки."""
         user = self.request.user
-        serializer.save(user=user)
+        # Счётчик подписчиков обновляется сигналом в той же транзакции.
+        with transaction.atomic():
+            serializer.save(user=user)
+
+
+class FeedView(PostExpandMixin, generics.ListAPIView):
+    """Лента постов авторов из подписок."""
+
+    serializer_class = PostSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = LimitOffsetOrKeysetPagination
+    keyset_ordering = ('-pub_date', '-id')
+
+    def get_queryset(self):
+        """Посты ленты, новые сначала."""
+        return get_feed(self.request.user, self.get_sparse_queryset(
+            Post.objects.select_related('author')))
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка постов с комментариями в NDJSON."""
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        """Выгрузка после поста с id из параметра after."""
+        try:
+            after = _positive_int(request.query_params.get('after', 0))
+        except ValueError:
+            raise ValidationError({'after': 'Ожидается id поста.'})
+        return StreamingHttpResponse(
+            iter_ndjson(after, settings.EXPORT_CHUNK_SIZE),
+            content_type='application/x-ndjson')
+
+
+class TokenRefreshRevocableView(TokenRefreshView):
+    """Обновление токена, кроме отозванных."""
+
+    serializer_class = RevocableTokenRefreshSerializer
+
+
+class TokenVerifyRevocableView(TokenVerifyView):
+    """Проверка токена с учётом отзыва."""
+
+    serializer_class = RevocableTokenVerifySerializer
+
+
+class TokenRevokeView(generics.GenericAPIView):
+    """Отзыв токена: достаточно владеть токеном."""
+
+    serializer_class = TokenRevokeSerializer
+    permission_classes = (AllowAny,)
+    authentication_classes = ()
+
+    def post(self, request):
+        """Отзыв токена из тела запроса."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 def page_not_found(request, exception) -> JsonResponse:
     """Ошибка 404: Объект не найден."""
     return JsonResponse({"message": "Объект не найден."})
+
+
+def metrics(request) -> HttpResponse:
+    """Метрики запросов в текстовом формате Prometheus."""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(registry.render(),
+                        content_type='text/plain; version=0.0.4')
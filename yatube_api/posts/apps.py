@@ -6,3 +6,7 @@ from django.apps import AppConfig  # type: ignore
 class PostsConfig(AppConfig):
     name = 'posts'
     verbose_name = 'Посты'
+
+    def ready(self):
+        """Подключение сигналов."""
+        from . import signals  # noqa: F401
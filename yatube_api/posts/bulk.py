@@ -0,0 +1,33 @@
+"""Пакетная запись."""
+
+from django.db import NotSupportedError, connection  # type: ignore
+from django.db.transaction import (  # type: ignore
+    TransactionManagementError)
+
+
+def bulk_create_with_pk(model, objs, batch_size=None):
+    """bulk_create, после которого у объектов есть первичные ключи.
+
+    PostgreSQL возвращает ключи из пакетной вставки. SQLite не
+    возвращает, но внутри транзакции первая вставка блокирует всю базу
+    на запись до фиксации, поэтому новые строки получают последние
+    ключи подряд и читаются одним запросом. На прочих базах параллельные
+    вставки перемежаются, и ключи так не восстановить.
+    Вызывать внутри transaction.atomic().
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=batch_size)
+    if connection.vendor != 'sqlite':
+        raise NotSupportedError(
+            f'{connection.vendor} не возвращает ключи из пакетной вставки.')
+    if not connection.in_atomic_block:
+        raise TransactionManagementError(
+            'Ключи пакетной вставки читаются только внутри транзакции.')
+    objs = model.objects.bulk_create(objs, batch_size=batch_size)
+    if not objs:
+        return objs
+    pks = model.objects.order_by('-pk').values_list(
+        'pk', flat=True)[:len(objs)]
+    for obj, pk in zip(objs, reversed(pks)):
+        obj.pk = pk
+    return objs
@@ -0,0 +1,27 @@
+"""Счётчики комментариев и подписчиков.
+
+Изменяются выражениями F() без чтения значения, поэтому параллельные
+запросы не теряют обновлений. Разошедшийся счётчик не уходит ниже
+нуля, расхождения исправляет команда reconcile_counters.
+"""
+
+from django.db.models import F  # type: ignore
+from django.db.models.functions import Greatest  # type: ignore
+
+from .models import Post, Profile
+
+
+def change_comment_count(post_id: int, delta: int) -> None:
+    """Изменение числа комментариев поста."""
+    Post.objects.filter(id=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0))
+
+
+def change_follower_count(user_id: int, delta: int) -> None:
+    """Изменение числа подписчиков пользователя."""
+    updated = Profile.objects.filter(user=user_id).update(
+        follower_count=Greatest(F('follower_count') + delta, 0))
+    if not updated and delta > 0:
+        Profile.objects.get_or_create(user_id=user_id)
+        Profile.objects.filter(user=user_id).update(
+            follower_count=F('follower_count') + delta)
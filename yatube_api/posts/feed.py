@@ -0,0 +1,143 @@
+"""Лента подписок.
+
+Новые посты раскладываются по лентам подписчиков при создании. Для авторов
+с большим числом подписчиков раскладка не выполняется, их посты
+добавляются в ленту при чтении.
+"""
+
+import heapq
+from collections import defaultdict
+
+from django.conf import settings  # type: ignore
+from django.db.models import Q  # type: ignore
+
+from .models import FeedEntry, Follow, Post, Profile
+
+
+def get_heavy_author_ids(author_ids):
+    """Авторы, подписчиков у которых больше порога раскладки.
+
+    Число подписчиков берётся из счётчика профиля; профиля нет только у
+    пользователей без подписчиков.
+    """
+    return list(
+        Profile.objects.filter(
+            user__in=author_ids,
+            follower_count__gt=settings.FEED_FANOUT_LIMIT)
+        .values_list('user', flat=True)
+    )
+
+
+def fan_out_posts(posts):
+    """Раскладка постов по лентам подписчиков."""
+    author_ids = {post.author_id for post in posts}
+    author_ids -= set(get_heavy_author_ids(author_ids))
+    followers = defaultdict(list)
+    for follower_id, author_id in Follow.objects.filter(
+            following__in=author_ids).values_list('user', 'following'):
+        followers[author_id].append(follower_id)
+    entries = [
+        FeedEntry(owner_id=follower_id, post=post, pub_date=post.pub_date)
+        for post in posts
+        for follower_id in followers[post.author_id]
+    ]
+    FeedEntry.objects.bulk_create(
+        entries, batch_size=settings.FEED_BATCH_SIZE, ignore_conflicts=True)
+
+
+def backfill_feed(follow):
+    """Добавление последних постов автора в ленту нового подписчика."""
+    if get_heavy_author_ids([follow.following_id]):
+        return
+    posts = Post.objects.filter(author=follow.following_id).order_by(
+        '-pub_date')[:settings.FEED_BACKFILL_SIZE]
+    FeedEntry.objects.bulk_create(
+        [FeedEntry(owner_id=follow.user_id, post=post,
+                   pub_date=post.pub_date)
+         for post in posts.only('id', 'pub_date')],
+        ignore_conflicts=True)
+
+
+def remove_from_feed(follow):
+    """Удаление постов автора из ленты бывшего подписчика."""
+    FeedEntry.objects.filter(
+        owner=follow.user_id, post__author=follow.following_id).delete()
+
+
+class FeedResults:
+    """Посты ленты пользователя, новые сначала.
+
+    Страница выбирается из записей ленты по индексу (owner, pub_date,
+    post) и из постов авторов без раскладки по индексу (author,
+    pub_date). Обе выборки уже упорядочены, они сливаются по (pub_date,
+    id), а посты страницы загружаются одним запросом из queryset.
+    Подходит для пагинации limit/offset и по ключу через after().
+    """
+
+    model = Post
+
+    def __init__(self, user, queryset):
+        self.queryset = queryset
+        self.entries = FeedEntry.objects.filter(owner=user)
+        heavy_author_ids = get_heavy_author_ids(
+            user.follows.values('following'))
+        # Посты, попавшие в ленту до того, как автор стал популярным,
+        # берутся из записей ленты.
+        self.heavy_posts = (
+            Post.objects.filter(author__in=heavy_author_ids)
+            .exclude(feed_entries__owner=user)
+            if heavy_author_ids else None)
+        self.total = None
+
+    def after(self, position):
+        """Лента после позиции (pub_date, id) ключа пагинации."""
+        pub_date, post_id = position
+        # Граница pub_date__lte делает условие диапазоном по индексу.
+        self.entries = self.entries.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, post__lt=post_id),
+            pub_date__lte=pub_date)
+        if self.heavy_posts is not None:
+            self.heavy_posts = self.heavy_posts.filter(
+                Q(pub_date__lt=pub_date)
+                | Q(pub_date=pub_date, id__lt=post_id),
+                pub_date__lte=pub_date)
+        self.total = None
+        return self
+
+    def count(self) -> int:
+        """Количество постов в ленте."""
+        if self.total is None:
+            self.total = self.entries.count()
+            if self.heavy_posts is not None:
+                self.total += self.heavy_posts.count()
+        return self.total
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def get_positions(self, stop):
+        """Первые stop пар (pub_date, id) обеих выборок по убыванию."""
+        sources = [
+            self.entries.order_by('-pub_date', '-post_id')
+            .values_list('pub_date', 'post_id')[:stop]
+        ]
+        if self.heavy_posts is not None:
+            sources.append(self.heavy_posts.order_by('-pub_date', '-id')
+                           .values_list('pub_date', 'id')[:stop])
+        return list(heapq.merge(*sources, reverse=True))[:stop]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        ids = [post_id for _, post_id in
+               self.get_positions(item.stop)[item.start:]]
+        posts = self.queryset.in_bulk(ids)
+        return [posts[post_id] for post_id in ids if post_id in posts]
+
+    def __iter__(self):
+        return iter(self[0:None])
+
+
+def get_feed(user, queryset):
+    """Лента пользователя, посты загружаются из queryset."""
+    return FeedResults(user, queryset)
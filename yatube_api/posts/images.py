@@ -0,0 +1,97 @@
+"""Обработка изображений постов.
+
+После сохранения поста с изображением создаются уменьшенные копии и
+миниатюра WebP, их адреса записываются в Post.image_variants. По умолчанию
+обработка идёт в пуле потоков процесса, чтобы не задерживать ответ.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings  # type: ignore
+from django.core.files.base import ContentFile  # type: ignore
+from django.core.files.storage import default_storage  # type: ignore
+from django.db import close_old_connections, transaction  # type: ignore
+from PIL import Image, ImageOps  # type: ignore
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Пул потоков обработки, создаётся при первом обращении."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            thread_name_prefix='post-images')
+    return _executor
+
+
+def schedule_image_processing(post: Post) -> None:
+    """Обработка изображения после фиксации транзакции."""
+    if not post.image:
+        return
+    post_id = post.id
+    transaction.on_commit(lambda: submit_image_processing(post_id))
+
+
+def submit_image_processing(post_id: int) -> None:
+    """Запуск обработки выбранным способом."""
+    if settings.IMAGE_PROCESSING_BACKEND == 'sync':
+        process_post_image(post_id)
+    else:
+        get_executor().submit(process_in_thread, post_id)
+
+
+def process_in_thread(post_id: int) -> None:
+    """Обработка в потоке пула со своим соединением с базой."""
+    try:
+        process_post_image(post_id)
+    except Exception:
+        logger.exception('Не удалось обработать изображение поста %s',
+                         post_id)
+    finally:
+        close_old_connections()
+
+
+def save_image(image, name: str, image_format: str) -> str:
+    """Сохранение изображения в хранилище, возвращает адрес."""
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, format=image_format)
+    return default_storage.url(
+        default_storage.save(name, ContentFile(buffer.getvalue())))
+
+
+def process_post_image(post_id: int) -> None:
+    """Уменьшенные копии и миниатюра изображения поста."""
+    post = Post.objects.filter(id=post_id).only('id', 'image').first()
+    if post is None or not post.image:
+        return
+    base, extension = os.path.splitext(post.image.name)
+    variants = {}
+    with post.image.open('rb') as file, Image.open(file) as original:
+        image_format = original.format or 'PNG'
+        image = ImageOps.exif_transpose(original)
+        for width in settings.IMAGE_VARIANT_WIDTHS:
+            if width >= image.width:
+                continue
+            variant = image.copy()
+            variant.thumbnail((width, image.height))
+            variants[str(width)] = save_image(
+                variant, f'{base}_{width}{extension}', image_format)
+        thumbnail = image.copy()
+        thumbnail.thumbnail(settings.IMAGE_THUMBNAIL_SIZE)
+        variants['thumbnail'] = save_image(
+            thumbnail, f'{base}_thumbnail.webp', 'WEBP')
+    # Изображение могли заменить, пока шла обработка.
+    if Post.objects.filter(id=post_id, image=post.image.name).exists():
+        post.image_variants = variants
+        post.save(update_fields=('image_variants',))
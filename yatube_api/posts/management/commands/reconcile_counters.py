@@ -0,0 +1,68 @@
+"""Пересчёт счётчиков комментариев и подписчиков."""
+
+from django.contrib.auth import get_user_model  # type: ignore
+from django.core.management.base import BaseCommand  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models import (Count, F, OuterRef,  # type: ignore
+                              Subquery, Value)
+from django.db.models.functions import Coalesce  # type: ignore
+
+from posts.models import Comment, Follow, Post, Profile
+
+User = get_user_model()
+
+
+def count_subquery(model, field, outer_field='pk'):
+    """Подзапрос количества связанных записей."""
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef(outer_field)})
+        .order_by().values(field)
+        .annotate(total=Count('pk')).values('total')
+    ), Value(0))
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев и подписчиков.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Количество записей в одной транзакции.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        posts = self.reconcile(
+            Post.objects.all(), 'comment_count',
+            count_subquery(Comment, 'post'), batch_size)
+        self.create_missing_profiles(batch_size)
+        profiles = self.reconcile(
+            Profile.objects.all(), 'follower_count',
+            count_subquery(Follow, 'following', 'user'), batch_size)
+        self.stdout.write(
+            f'Исправлено постов: {posts}, профилей: {profiles}.')
+
+    def reconcile(self, queryset, field, actual, batch_size):
+        """Исправление расхождений по диапазонам первичного ключа."""
+        fixed = 0
+        last_pk = 0
+        while True:
+            pks = list(queryset.filter(pk__gt=last_pk).order_by('pk')
+                       .values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return fixed
+            with transaction.atomic():
+                fixed += (
+                    queryset.filter(pk__gte=pks[0], pk__lte=pks[-1])
+                    .annotate(actual=actual).exclude(**{field: F('actual')})
+                    .update(**{field: actual})
+                )
+            last_pk = pks[-1]
+
+    def create_missing_profiles(self, batch_size):
+        """Профили для пользователей с подписчиками."""
+        user_ids = (User.objects.filter(profile__isnull=True,
+                                        followers__isnull=False)
+                    .distinct().values_list('pk', flat=True))
+        Profile.objects.bulk_create(
+            (Profile(user_id=user_id) for user_id in user_ids.iterator()),
+            batch_size=batch_size, ignore_conflicts=True)
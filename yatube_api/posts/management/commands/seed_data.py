@@ -0,0 +1,275 @@
+"""Синтетические данные для нагрузочных тестов.
+
+Записи вставляются пакетами через bulk_create. Подписки, посты и
+комментарии делятся на части по --chunk-size строк, части вставляют
+параллельные процессы. У каждой части свой генератор случайных чисел
+от --seed, поэтому одинаковые параметры дают одинаковые данные при
+любом числе процессов. Даты отсчитываются от момента запуска, а
+первичные ключи совпадают только при --workers 1.
+
+Граф подписок степенной: число подписок пользователя распределено по
+Парето, авторы выбираются по закону Ципфа. Популярные посты так же
+получают больше комментариев. Внешние ключи берутся из только что
+созданных записей, поэтому их проверка на время вставки отключается,
+а SQLite не ждёт сброса на диск после каждой транзакции. Пример:
+
+    python manage.py seed_data --users 100000 --posts 1000000 \\
+        --comments 10000000 --workers 8
+"""
+
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model  # type: ignore
+from django.contrib.auth.hashers import make_password  # type: ignore
+from django.core.management import call_command  # type: ignore
+from django.core.management.base import BaseCommand  # type: ignore
+from django.db import connection, connections, transaction  # type: ignore
+from django.db.models import Max  # type: ignore
+from django.utils import timezone  # type: ignore
+
+from posts.bulk import bulk_create_with_pk
+from posts.feed import fan_out_posts
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+USERNAME = 'seed_{number}'
+PASSWORD = 'seed-password'
+# Даты постов и комментариев распределены по последнему году.
+PERIOD = timedelta(days=365)
+
+# Данные части, общие для процессов, задаёт init_worker.
+_state: dict = {}
+
+
+def zipf_weights(count, alpha):
+    """Накопленные веса закона Ципфа для random.choices."""
+    return list(accumulate(1 / (rank + 1) ** alpha for rank in range(count)))
+
+
+def chunk_rng(seed, kind, first):
+    """Генератор случайных чисел части, не зависящий от процесса."""
+    return random.Random(f'{seed}:{kind}:{first}')
+
+
+@contextmanager
+def explicit_dates(*fields):
+    """Даты из объектов вместо auto_now_add."""
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+@contextmanager
+def relaxed_checks():
+    """Вставка без проверки внешних ключей и синхронной записи SQLite."""
+    with connection.constraint_checks_disabled():
+        if connection.vendor != 'sqlite':
+            yield
+            return
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            synchronous = cursor.fetchone()[0]
+            cursor.execute('PRAGMA synchronous = OFF')
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA synchronous = {synchronous}')
+
+
+@contextmanager
+def writing():
+    """Транзакция вставки части.
+
+    SQLite допускает одного писателя, и процессы, одновременно
+    начавшие транзакции, получают ошибку блокировки вместо ожидания.
+    Поэтому записи строятся параллельно, а вставляются по очереди.
+    """
+    with _state['lock'] or nullcontext(), relaxed_checks(), \
+            transaction.atomic():
+        yield
+
+
+def init_worker(state):
+    """Общие данные и веса выбора для частей."""
+    _state.clear()
+    _state.update(state)
+    _state['user_weights'] = zipf_weights(len(state['user_ids']),
+                                          state['alpha'])
+    _state['post_weights'] = zipf_weights(len(state.get('post_ids', ())),
+                                          state['alpha'])
+
+
+def insert_follows(rng, first, size):
+    """Подписки пользователей с номерами first..first + size."""
+    user_ids = _state['user_ids']
+
+    follows = []
+    for user_id in user_ids[first:first + size]:
+        degree = min(len(user_ids) - 1,
+                     int(rng.paretovariate(2) * _state['follows'] / 2))
+        targets = set(rng.choices(user_ids, cum_weights=_state['user_weights'],
+                                  k=degree))
+        targets.discard(user_id)
+        follows.extend(Follow(user_id=user_id, following_id=following_id)
+                       for following_id in sorted(targets))
+    with writing():
+        Follow.objects.bulk_create(follows, ignore_conflicts=True)
+
+
+def insert_posts(rng, first, size):
+    """Посты с номерами first..first + size."""
+    authors = rng.choices(_state['user_ids'],
+                          cum_weights=_state['user_weights'], k=size)
+    group_ids = _state['group_ids']
+    posts = [
+        Post(text=f'Пост {number} ' + 'текст ' * rng.randint(5, 50),
+             author_id=author_id,
+             group_id=(rng.choice(group_ids)
+                       if group_ids and rng.random() < 0.5 else None),
+             pub_date=_state['start'] + _state['step'] * number)
+        for number, author_id in enumerate(authors, first)
+    ]
+    with writing(), explicit_dates(Post._meta.get_field('pub_date')):
+        posts = bulk_create_with_pk(Post, posts)
+        if _state['feed']:
+            fan_out_posts(posts)
+
+
+def insert_comments(rng, first, size):
+    """Комментарии с номерами first..first + size, чаще к популярным."""
+    posts = rng.choices(_state['post_ids'],
+                        cum_weights=_state['post_weights'], k=size)
+    user_ids = _state['user_ids']
+    comments = [
+        Comment(text=f'Комментарий {number}',
+                author_id=rng.choice(user_ids), post_id=post_id,
+                created=_state['start'] + _state['step'] * number)
+        for number, post_id in enumerate(posts, first)
+    ]
+    with writing(), explicit_dates(Comment._meta.get_field('created')):
+        Comment.objects.bulk_create(comments)
+
+
+INSERTS = {
+    'follows': insert_follows,
+    'posts': insert_posts,
+    'comments': insert_comments,
+}
+
+
+def insert_chunk(task):
+    """Вставка одной части, возвращает её размер."""
+    kind, first, size = task
+    INSERTS[kind](chunk_rng(_state['seed'], kind, first), first, size)
+    return size
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими данными для нагрузочных тестов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--comments', type=int, default=50000)
+        parser.add_argument(
+            '--follows', type=int, default=20,
+            help='Среднее число подписок пользователя.')
+        parser.add_argument(
+            '--alpha', type=float, default=1.1,
+            help='Показатель закона Ципфа.')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument(
+            '--workers', type=int, default=multiprocessing.cpu_count(),
+            help='Число процессов вставки.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=20000,
+            help='Количество записей в одной транзакции.')
+        parser.add_argument(
+            '--feed', action='store_true',
+            help='Раскладывать посты по лентам подписчиков, как при '
+                 'создании через API (медленно).')
+
+    def handle(self, *args, **options):
+        self.options = options
+        started = time.perf_counter()
+        last_post_pk = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+        state = {
+            'seed': options['seed'],
+            'alpha': options['alpha'],
+            'follows': options['follows'],
+            'feed': options['feed'],
+            'user_ids': self.create_users(options['users']),
+            'group_ids': self.create_groups(options['groups']),
+        }
+        self.run('follows', options['users'], state)
+        # Номер записи задаёт её дату, последняя запись — сейчас.
+        now = timezone.now()
+        state['start'] = now - PERIOD
+        state['step'] = PERIOD / max(options['posts'], 1)
+        self.run('posts', options['posts'], state)
+        state['post_ids'] = list(
+            Post.objects.filter(pk__gt=last_post_pk)
+            .order_by('pub_date', 'pk').values_list('pk', flat=True))
+        state['step'] = PERIOD / max(options['comments'], 1)
+        self.run('comments', options['comments'], state)
+        # bulk_create не вызывает сигналы, счётчики считаются целиком.
+        call_command('reconcile_counters', stdout=self.stdout)
+        self.stdout.write(
+            f'Готово за {time.perf_counter() - started:.1f} с.')
+
+    def create_users(self, count):
+        """Пользователи с паролем PASSWORD в порядке номеров."""
+        password = make_password(PASSWORD)
+        users = User.objects.bulk_create(
+            (User(username=USERNAME.format(number=number), password=password)
+             for number in range(count)),
+            batch_size=self.options['chunk_size'])
+        by_username = dict(
+            User.objects.filter(username__startswith=USERNAME.split('{')[0])
+            .values_list('username', 'pk'))
+        return [by_username[user.username] for user in users]
+
+    def create_groups(self, count):
+        """Группы в порядке номеров."""
+        with transaction.atomic():
+            groups = bulk_create_with_pk(Group, [
+                Group(title=f'Группа {number}', slug=f'seed-{number}',
+                      description='Группа для нагрузочных тестов.')
+                for number in range(count)
+            ])
+        return [group.pk for group in groups]
+
+    def run(self, kind, count, state):
+        """Вставка count записей частями в нескольких процессах."""
+        started = time.perf_counter()
+        chunk_size = self.options['chunk_size']
+        tasks = [(kind, first, min(chunk_size, count - first))
+                 for first in range(0, count, chunk_size)]
+        workers = min(self.options['workers'], len(tasks))
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            # Процессы открывают свои соединения вместо унаследованных.
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            lock = context.Lock() if connection.vendor == 'sqlite' else None
+            with context.Pool(workers, init_worker,
+                              ({**state, 'lock': lock},)) as pool:
+                for _ in pool.imap_unordered(insert_chunk, tasks):
+                    pass
+        else:
+            init_worker({**state, 'lock': None})
+            for task in tasks:
+                insert_chunk(task)
+        self.stdout.write(
+            f'{kind}: {count} за {time.perf_counter() - started:.1f} с.')
@@ -0,0 +1,84 @@
+from django.db import migrations
+
+SQLITE_FORWARD = (
+    '''CREATE VIRTUAL TABLE posts_post_fts USING fts5(
+        text, content='posts_post', content_rowid='id')''',
+    '''CREATE TRIGGER posts_post_fts_insert AFTER INSERT ON posts_post BEGIN
+        INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text);
+    END''',
+    '''CREATE TRIGGER posts_post_fts_delete AFTER DELETE ON posts_post BEGIN
+        INSERT INTO posts_post_fts(posts_post_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+    END''',
+    '''CREATE TRIGGER posts_post_fts_update AFTER UPDATE OF text ON posts_post
+    BEGIN
+        INSERT INTO posts_post_fts(posts_post_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+        INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text);
+    END''',
+    '''INSERT INTO posts_post_fts(posts_post_fts) VALUES ('rebuild')''',
+    '''CREATE VIRTUAL TABLE posts_comment_fts USING fts5(
+        text, post_id UNINDEXED,
+        content='posts_comment', content_rowid='id')''',
+    '''CREATE TRIGGER posts_comment_fts_insert AFTER INSERT ON posts_comment
+    BEGIN
+        INSERT INTO posts_comment_fts(rowid, text, post_id)
+        VALUES (new.id, new.text, new.post_id);
+    END''',
+    '''CREATE TRIGGER posts_comment_fts_delete AFTER DELETE ON posts_comment
+    BEGIN
+        INSERT INTO posts_comment_fts(posts_comment_fts, rowid, text, post_id)
+        VALUES ('delete', old.id, old.text, old.post_id);
+    END''',
+    '''CREATE TRIGGER posts_comment_fts_update
+    AFTER UPDATE OF text ON posts_comment BEGIN
+        INSERT INTO posts_comment_fts(posts_comment_fts, rowid, text, post_id)
+        VALUES ('delete', old.id, old.text, old.post_id);
+        INSERT INTO posts_comment_fts(rowid, text, post_id)
+        VALUES (new.id, new.text, new.post_id);
+    END''',
+    '''INSERT INTO posts_comment_fts(posts_comment_fts) VALUES ('rebuild')''',
+)
+SQLITE_BACKWARD = (
+    'DROP TABLE posts_post_fts',
+    'DROP TRIGGER posts_post_fts_insert',
+    'DROP TRIGGER posts_post_fts_delete',
+    'DROP TRIGGER posts_post_fts_update',
+    'DROP TABLE posts_comment_fts',
+    'DROP TRIGGER posts_comment_fts_insert',
+    'DROP TRIGGER posts_comment_fts_delete',
+    'DROP TRIGGER posts_comment_fts_update',
+)
+POSTGRESQL_FORWARD = (
+    '''CREATE INDEX post_text_search_idx ON posts_post
+        USING GIN (to_tsvector('russian', text))''',
+    '''CREATE INDEX comment_text_search_idx ON posts_comment
+        USING GIN (to_tsvector('russian', text))''',
+)
+POSTGRESQL_BACKWARD = (
+    'DROP INDEX post_text_search_idx',
+    'DROP INDEX comment_text_search_idx',
+)
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD,
+                 'postgresql': POSTGRESQL_FORWARD}),
+            run({'sqlite': SQLITE_BACKWARD,
+                 'postgresql': POSTGRESQL_BACKWARD}),
+        ),
+    ]
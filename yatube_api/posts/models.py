@@ -33,17 +33,30 @@ class Post(models.Model):
                                     auto_now_add=True)
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='posts',
-        verbose_name='Автор')
+        verbose_name='Автор', db_index=False)
     image = models.ImageField(
         upload_to='posts/', null=True, blank=True,
         verbose_name='Изображение')
     group = models.ForeignKey(
         Group, on_delete=models.CASCADE, related_name='group_posts',
-        verbose_name='Группа', blank=True, null=True)
+        verbose_name='Группа', blank=True, null=True, db_index=False)
+    comment_count = models.PositiveIntegerField(
+        default=0, verbose_name='Количество комментариев')
+    image_variants = models.JSONField(
+        default=dict, blank=True, verbose_name='Варианты изображения')
 
     class Meta:
         verbose_name = 'Посты'
-        ordering = ('pub_date',)
+        ordering = ('pub_date', 'id')
+        # Индексы по внешним ключам заменены составными с датой.
+        indexes = [
+            models.Index(fields=('pub_date', 'id'),
+                         name='post_pub_date_id_idx'),
+            models.Index(fields=('group', 'pub_date'),
+                         name='post_group_pub_date_idx'),
+            models.Index(fields=('author', 'pub_date'),
+                         name='post_author_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.text
@@ -57,13 +70,18 @@ class Comment(models.Model):
         verbose_name='Автор')
     post = models.ForeignKey(
         Post, on_delete=models.CASCADE, related_name='comments',
-        verbose_name='Пост')
+        verbose_name='Пост', db_index=False)
     text = models.TextField(verbose_name='Текст')
     created = models.DateTimeField(
         verbose_name='Дата добавления', auto_now_add=True, db_index=True)
 
     class Meta:
         verbose_name = 'Комментарии'
+        ordering = ('created', 'id')
+        indexes = [
+            models.Index(fields=('post', 'created'),
+                         name='comment_post_created_idx'),
+        ]
 
 
 class Follow(models.Model):
@@ -74,10 +92,15 @@ class Follow(models.Model):
         verbose_name='Подписчик', editable=True)
     following = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name='followers',
-        verbose_name='На кого подписаны', editable=True)
+        verbose_name='На кого подписаны', editable=True, db_index=False)
 
     class Meta:
         verbose_name = 'Подписки'
+        indexes = [
+            # Подписчики автора без обращения к таблице.
+            models.Index(fields=('following', 'user'),
+                         name='follow_following_user_idx'),
+        ]
         constraints = [
             # Нельзя подписаться на себя.
             models.CheckConstraint(
@@ -89,3 +112,41 @@ class Follow(models.Model):
                 fields=('user', 'following'),
                 name='unique_user_following'),
         ]
+
+
+class Profile(models.Model):
+    """Профиль пользователя со счётчиками."""
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name='profile',
+        verbose_name='Пользователь')
+    follower_count = models.PositiveIntegerField(
+        default=0, verbose_name='Количество подписчиков')
+
+    class Meta:
+        verbose_name = 'Профили'
+
+
+class FeedEntry(models.Model):
+    """Запись ленты подписчика."""
+
+    owner = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='feed_entries',
+        verbose_name='Владелец ленты')
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='feed_entries',
+        verbose_name='Пост')
+    pub_date = models.DateTimeField(verbose_name='Дата публикации')
+
+    class Meta:
+        verbose_name = 'Записи ленты'
+        indexes = [
+            # Чтение ленты - диапазон по владельцу в порядке даты.
+            models.Index(fields=('owner', 'pub_date', 'post'),
+                         name='feed_owner_pub_date_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=('owner', 'post'),
+                name='unique_feed_owner_post'),
+        ]
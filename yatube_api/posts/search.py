@@ -0,0 +1,112 @@
+"""Полнотекстовый поиск по постам и комментариям.
+
+Индексы создаются миграцией 0005_search: на SQLite - таблицы FTS5 с
+триггерами синхронизации, на PostgreSQL - GIN-индексы по tsvector текста.
+Индексы обновляет сама база, поэтому поиск видит и записи, созданные
+через bulk_create. На остальных базах поиск идёт через LIKE.
+"""
+
+import re
+
+from django.db import connection  # type: ignore
+from django.db.models import Q  # type: ignore
+
+INDEXED_VENDORS = ('sqlite', 'postgresql')
+SQLITE_MATCHES = '''
+    SELECT rowid AS post_id, -bm25(posts_post_fts) AS rank
+    FROM posts_post_fts WHERE posts_post_fts MATCH %s
+    UNION ALL
+    SELECT post_id, -bm25(posts_comment_fts) AS rank
+    FROM posts_comment_fts WHERE posts_comment_fts MATCH %s
+'''
+POSTGRESQL_MATCHES = '''
+    SELECT id AS post_id,
+           ts_rank(to_tsvector('russian', text), query) AS rank
+    FROM posts_post, plainto_tsquery('russian', %s) AS query
+    WHERE to_tsvector('russian', text) @@ query
+    UNION ALL
+    SELECT post_id, ts_rank(to_tsvector('russian', text), query) AS rank
+    FROM posts_comment, plainto_tsquery('russian', %s) AS query
+    WHERE to_tsvector('russian', text) @@ query
+'''
+
+
+def get_match_params(query: str):
+    """Запрос совпадений к индексу или None для пустого запроса."""
+    if connection.vendor == 'sqlite':
+        # Слова в кавычках, чтобы пользовательский ввод не был синтаксисом.
+        words = re.findall(r'\w+', query)
+        if not words:
+            return None
+        match = ' '.join(f'"{word}"' for word in words)
+        return SQLITE_MATCHES, (match, match)
+    return POSTGRESQL_MATCHES, (query, query)
+
+
+class SearchResults:
+    """Посты по запросу в порядке релевантности.
+
+    Срез выполняет запрос к индексу с LIMIT и OFFSET и загружает только
+    посты страницы, поэтому подходит для пагинации limit/offset.
+    """
+
+    def __init__(self, query: str, queryset):
+        self.query = query
+        self.queryset = queryset
+        self.indexed = connection.vendor in INDEXED_VENDORS
+        self.match = get_match_params(query) if self.indexed else None
+        self.total = None
+
+    def fallback(self):
+        """Поиск без индекса на прочих базах."""
+        return self.queryset.filter(
+            Q(text__icontains=self.query)
+            | Q(comments__text__icontains=self.query)
+        ).distinct().order_by('-pub_date', '-id')
+
+    def count(self) -> int:
+        """Количество найденных постов."""
+        if self.total is None:
+            if not self.indexed:
+                self.total = self.fallback().count()
+            elif self.match is None:
+                self.total = 0
+            else:
+                sql, params = self.match
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'SELECT COUNT(DISTINCT post_id) FROM ({sql}) '
+                        'AS matches', params)
+                    self.total = cursor.fetchone()[0]
+        return self.total
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def get_ids(self, offset: int, limit):
+        """id постов страницы по убыванию релевантности."""
+        sql, params = self.match
+        if limit is None and connection.vendor == 'sqlite':
+            limit = -1
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT post_id FROM ({sql}) AS matches GROUP BY post_id '
+                'ORDER BY MAX(rank) DESC, post_id LIMIT %s OFFSET %s',
+                (*params, limit, offset))
+            return [row[0] for row in cursor.fetchall()]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        offset = item.start or 0
+        limit = None if item.stop is None else max(item.stop - offset, 0)
+        if not self.indexed:
+            return list(self.fallback()[item])
+        if self.match is None:
+            return []
+        ids = self.get_ids(offset, limit)
+        posts = self.queryset.in_bulk(ids)
+        return [posts[post_id] for post_id in ids if post_id in posts]
+
+    def __iter__(self):
+        return iter(self[0:None])
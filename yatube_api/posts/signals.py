@@ -0,0 +1,54 @@
+"""Обработчики сигналов моделей."""
+
+from django.db.models.signals import post_delete, post_save  # type: ignore
+from django.dispatch import receiver  # type: ignore
+
+from .counters import change_comment_count, change_follower_count
+from .feed import backfill_feed, fan_out_posts, remove_from_feed
+from .models import Comment, Follow, Post
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, raw=False, **kwargs):
+    """Новый пост попадает в ленты подписчиков."""
+    if created and not raw:
+        fan_out_posts([instance])
+
+
+@receiver(post_save, sender=Follow)
+def backfill_new_follow(sender, instance, created, raw=False, **kwargs):
+    """Новая подписка заполняет ленту постами автора."""
+    if created and not raw:
+        backfill_feed(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def clean_removed_follow(sender, instance, **kwargs):
+    """Отписка убирает посты автора из ленты."""
+    remove_from_feed(instance)
+
+
+@receiver(post_save, sender=Comment)
+def count_new_comment(sender, instance, created, raw=False, **kwargs):
+    """Новый комментарий увеличивает счётчик поста."""
+    if created and not raw:
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_removed_comment(sender, instance, **kwargs):
+    """Удалённый комментарий уменьшает счётчик поста."""
+    change_comment_count(instance.post_id, -1)
+
+
+@receiver(post_save, sender=Follow)
+def count_new_follower(sender, instance, created, raw=False, **kwargs):
+    """Новая подписка увеличивает счётчик автора."""
+    if created and not raw:
+        change_follower_count(instance.following_id, 1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_removed_follower(sender, instance, **kwargs):
+    """Отписка уменьшает счётчик автора."""
+    change_follower_count(instance.following_id, -1)
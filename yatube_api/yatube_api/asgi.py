@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application  # type: ignore
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube_api.settings')
+# Чтение API выполняется в пуле потоков, а не в общем потоке Django.
+os.environ.setdefault('ASYNC_READ_VIEWS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,57 @@
+"""Проверка постоянных соединений с базой."""
+
+import functools
+
+from django.conf import settings  # type: ignore
+from django.core.signals import request_started  # type: ignore
+from django.db import connections  # type: ignore
+from django.dispatch import receiver  # type: ignore
+
+
+def close_if_health_check_failed(connection) -> None:
+    """Закрытие неработающего соединения, один раз за запрос."""
+    if not connection.health_check_pending:
+        return
+    connection.health_check_pending = False
+    if (connection.connection is not None
+            and not connection.in_atomic_block
+            and not connection.is_usable()):
+        connection.close()
+
+
+def install_health_check(connection) -> None:
+    """Проверка перед первым курсором или транзакцией, как в Django 4.1.
+
+    ensure_connection не подходит: Django вызывает его и в начале и
+    конце каждого запроса через close_old_connections.
+    """
+    def checked(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            close_if_health_check_failed(connection)
+            return method(*args, **kwargs)
+        return wrapper
+
+    connection.health_check_pending = False
+    connection._cursor = checked(connection._cursor)
+    connection.set_autocommit = checked(connection.set_autocommit)
+
+
+@receiver(request_started)
+def check_connections(**kwargs):
+    """Закрытие соединений, которые перестали отвечать.
+
+    При CONN_MAX_AGE соединение переживает запрос, и база может
+    закрыть его по таймауту или при перезапуске. Как CONN_HEALTH_CHECKS
+    в Django 4.1, соединение проверяется один раз за запрос при первом
+    обращении: ответы из кэша, 304 и отклонённые запросы не ждут
+    проверки. Вместо закрытого откроется новое соединение.
+    """
+    if not settings.DATABASE_HEALTH_CHECKS:
+        return
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        if not hasattr(connection, 'health_check_pending'):
+            install_health_check(connection)
+        connection.health_check_pending = True
@@ -0,0 +1,94 @@
+"""Маршрутизация запросов между основной базой и репликами."""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings  # type: ignore
+from django.core.cache import caches  # type: ignore
+
+PIN_KEY = 'db:pin:{user_id}'
+COLLECTION_PIN_KEY = 'db:pin:collection:{namespace}'
+
+# Чтение с реплик разрешено только внутри replica_reads().
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def enable_replica_reads():
+    """Разрешить чтение с реплик, вернуть метку для отмены."""
+    return _replica_reads.set(True)
+
+
+def disable_replica_reads(token) -> None:
+    """Вернуть чтение в основную базу."""
+    _replica_reads.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """Чтение с реплик в пределах блока."""
+    token = enable_replica_reads()
+    try:
+        yield
+    finally:
+        disable_replica_reads(token)
+
+
+def get_pin_cache():
+    """Кэш привязок из DATABASE_REPLICA_PIN_CACHE."""
+    return caches[settings.DATABASE_REPLICA_PIN_CACHE]
+
+
+def pin_to_primary(user_id: int) -> None:
+    """Чтение пользователя с основной базы сразу после его записи.
+
+    Пока реплики догоняют основную базу, пользователь видит свои
+    изменения. Привязка действует во всех процессах сервера, только
+    если кэш привязок общий, например Redis.
+    """
+    get_pin_cache().set(PIN_KEY.format(user_id=user_id), True,
+                        settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id: int) -> bool:
+    """Пользователь недавно писал в основную базу."""
+    return get_pin_cache().get(PIN_KEY.format(user_id=user_id), False)
+
+
+def pin_collection(namespace: str) -> None:
+    """Чтение коллекции с основной базы сразу после смены её версии.
+
+    Ответы с ETag и из кэша сохраняются под версией основной базы.
+    Пока реплики догоняют её, они сохранили бы старые строки под новой
+    версией до следующего изменения.
+    """
+    get_pin_cache().set(COLLECTION_PIN_KEY.format(namespace=namespace),
+                        True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_collection_pinned(namespace: str) -> bool:
+    """Версия коллекции недавно менялась."""
+    return get_pin_cache().get(
+        COLLECTION_PIN_KEY.format(namespace=namespace), False)
+
+
+class ReplicaRouter:
+    """Чтение с реплик из DATABASE_REPLICAS, запись в основную базу.
+
+    Без replica_reads() или без реплик чтение идёт в основную базу,
+    поэтому транзакции и проверки перед записью видят свежие данные.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Случайная реплика для чтения."""
+        if _replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        """Запись только в основную базу."""
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Реплики содержат те же данные, связи разрешены."""
+        return True
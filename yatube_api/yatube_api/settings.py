@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from datetime import timedelta
@@ -24,6 +25,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.QueryInspectorMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,13 +59,60 @@ TEMPLATES = [
 WSGI_APPLICATION = 'yatube_api.wsgi.application'
 
 
+# База задаётся окружением, например DB_ENGINE=django.db.backends.postgresql.
+# Соединение живёт DB_CONN_MAX_AGE секунд и переиспользуется запросами
+# одного потока, 0 закрывает его после каждого запроса.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'USER': os.getenv('DB_USER', ''),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', ''),
+        'PORT': os.getenv('DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
     }
 }
 
+# Проверка постоянных соединений в начале запроса.
+DATABASE_HEALTH_CHECKS = os.getenv('DB_HEALTH_CHECKS', '1') == '1'
+
+# Асинхронные представления чтения, включаются в asgi.py.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', '0') == '1'
+# Потоки пула, в котором выполняются запросы на чтение под ASGI.
+ASYNC_READ_WORKERS = int(os.getenv('ASYNC_READ_WORKERS', '16'))
+
+# Реплика для чтения, например копия файла SQLite или реплика PostgreSQL.
+# В тестах реплика указывает на тестовую основную базу.
+if os.getenv('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DATABASE_REPLICA_NAME'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['yatube_api.db_router.ReplicaRouter']
+# Время чтения с основной базы после записи пользователя, секунды.
+DATABASE_REPLICA_PIN_SECONDS = 5
+# Кэш привязок к основной базе. Запрос после записи может попасть в
+# другой процесс сервера, поэтому при нескольких процессах нужен общий
+# кэш, например Redis: LocMemCache видит привязку только в процессе,
+# который принял запись.
+DATABASE_REPLICA_PIN_CACHE = os.getenv('DATABASE_REPLICA_PIN_CACHE',
+                                       'default')
+
+# Бэкенд кэша задаётся окружением, например django_redis.cache.RedisCache.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+API_CACHE_TIMEOUT = 300
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -91,18 +141,92 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    # Ограничивают только запись в представлениях с throttle_scope.
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.UserTokenBucketThrottle',
+        'api.throttling.IPTokenBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'posts_user': '20/min',
+        'posts_ip': '60/min',
+        'posts_bulk_user': '10/min',
+        'posts_bulk_ip': '30/min',
+        'comments_user': '30/min',
+        'comments_ip': '100/min',
+        'comments_bulk_user': '10/min',
+        'comments_bulk_ip': '30/min',
+        'follow_user': '30/min',
+        'follow_ip': '100/min',
+    },
 }
 
+# Хранилище вёдер ограничения частоты: CacheBucketStore (кэш Django),
+# MemoryBucketStore (память процесса) или FileLockBucketStore (файлы).
+THROTTLE_STORE = os.getenv('THROTTLE_STORE',
+                           'api.throttling.CacheBucketStore')
+THROTTLE_FILE_PATH = os.getenv('THROTTLE_FILE_PATH',
+                               BASE_DIR / 'throttle')
+
+# Метрики запросов: гистограммы по маршрутам на /metrics и заголовок
+# Server-Timing. Метрики отдаются только адресам из METRICS_ALLOWED_IPS.
+# Server-Timing показывает любому клиенту число запросов к базе и их
+# время, поэтому включается явно, например для benchmarks/run.py.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+METRICS_SERVER_TIMING = os.getenv('METRICS_SERVER_TIMING', '0') == '1'
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS',
+                                '127.0.0.1,::1').split(',')
+
+# Поиск N+1 и медленных запросов, предупреждения в лог api.query_inspector.
+QUERY_INSPECTOR = os.getenv('QUERY_INSPECTOR', '0') == '1'
+# Сколько запросов одной формы допустимо за запрос к API.
+QUERY_REPEAT_LIMIT = int(os.getenv('QUERY_REPEAT_LIMIT', '3'))
+SLOW_QUERY_SECONDS = float(os.getenv('SLOW_QUERY_SECONDS', '0.1'))
+
+# Библиотека JSON для ответов: orjson, если установлен, или json.
+JSON_RENDERER_BACKEND = os.getenv('JSON_RENDERER_BACKEND', 'orjson')
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Время хранения пользователя из токена в кэше, секунды.
+JWT_USER_CACHE_TIMEOUT = 60
+
+# Отзыв токенов: период обновления фильтра в памяти, секунды.
+JWT_REVOCATION_REFRESH = 30
+JWT_REVOCATION_CAPACITY = 10000
+JWT_REVOCATION_ERROR_RATE = 0.001
+
+# Лента: авторы с большим числом подписчиков читаются без раскладки.
+FEED_FANOUT_LIMIT = 1000
+FEED_BACKFILL_SIZE = 50
+FEED_BATCH_SIZE = 1000
+
+# Пакетное создание постов и комментариев.
+BULK_MAX_ITEMS = 1000
+BULK_BATCH_SIZE = 500
+
+EXPORT_CHUNK_SIZE = 1000
+
+# Обработка изображений постов: 'thread' - пул потоков, 'sync' - сразу.
+IMAGE_PROCESSING_BACKEND = 'thread'
+IMAGE_PROCESSING_WORKERS = 2
+IMAGE_VARIANT_WIDTHS = (320, 640, 1280)
+IMAGE_THUMBNAIL_SIZE = (160, 160)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
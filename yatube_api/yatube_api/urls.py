@@ -1,15 +1,24 @@
 """Адреса проекта."""
 
+from django.conf import settings  # type: ignore
+from django.conf.urls.static import static  # type: ignore
 from django.contrib import admin  # type: ignore
 from django.urls import include, path  # type: ignore
 from django.views.generic import TemplateView  # type: ignore
 
+from api.views import metrics
+
 urlpatterns: list[path] = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    path('metrics', metrics, name='metrics'),
     path(
         'redoc/',
         TemplateView.as_view(template_name='redoc.html'),
         name='redoc'
     ),
 ]
+
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL,
+                          document_root=settings.MEDIA_ROOT)